@@ -1,9 +1,2 @@
-"""Import algorithm modules here."""
-
-import pyrate.algorithms.variables
-import pyrate.algorithms.trees
-import pyrate.algorithms.plots
-import pyrate.algorithms.histograms
-import pyrate.algorithms.regions
-
-import pyrate.algorithms.muondet
+"""Algorithm modules. They are found by the algorithm registry (see pyrate.core.Registry)
+and imported only when a configured object requires them."""
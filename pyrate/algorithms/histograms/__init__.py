@@ -1 +1,10 @@
-from pyrate.algorithms.histograms.FillHists import FillHists
+"""Histogram algorithms. Algorithms are imported when first accessed."""
+
+from pyrate.utils.functions import lazy_getattr
+
+__getattr__ = lazy_getattr(
+    __name__,
+    [
+        "FillHists",
+    ],
+)
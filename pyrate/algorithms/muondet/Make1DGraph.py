@@ -50,7 +50,8 @@ class Make1DGraph(Algorithm):
                     # ----------------------
                     a = {}
 
-                    a["y_entries"] = [[] for i in range(n_bins + 1)]
+                    # one list of entries per bin, merged bin by bin.
+                    a["y_entries"] = tuple([] for i in range(n_bins + 1))
                     a["x_axis"] = np.linspace(x_low, x_high, num=n_bins + 1)
 
                     # ----------------------
@@ -1,11 +1,16 @@
-"""This module is intended as an example only."""
+"""This module is intended as an example only. Algorithms are imported when first accessed."""
 
-from pyrate.algorithms.muondet.MuonDetCharge import MuonDetCharge
-from pyrate.algorithms.muondet.Make1DGraph import Make1DGraph
-from pyrate.algorithms.muondet.TrueEnergy import TrueEnergy
-from pyrate.algorithms.muondet.TimeWeightedPulse import TimeWeightedPulse
-from pyrate.algorithms.muondet.ParticleHitPosition import ParticleHitPosition
-from pyrate.algorithms.muondet.SimulatedWaveformsBuilder import (
-    SimulatedWaveformsBuilder,
+from pyrate.utils.functions import lazy_getattr
+
+__getattr__ = lazy_getattr(
+    __name__,
+    [
+        "MuonDetCharge",
+        "Make1DGraph",
+        "TrueEnergy",
+        "TimeWeightedPulse",
+        "ParticleHitPosition",
+        "SimulatedWaveformsBuilder",
+        "SimulatedWaveformsGetter",
+    ],
 )
-from pyrate.algorithms.muondet.SimulatedWaveformsGetter import SimulatedWaveformsGetter
@@ -161,6 +161,26 @@ class Make1DHistPlot(Algorithm):
                             # the presence of an object, not its value.
                             self.store.put(obj_counter, "done")
 
+    def execute_batch(self, config, n):
+        """Fills histograms with a batch of events."""
+        i_name = self.store.get("INPUT:name")
+
+        for f_name, f_attr in config["folders"].items():
+            for v_name, v_attr in f_attr["variables"].items():
+                for r_name in self.make_regions_list(f_attr):
+
+                    h_name = self.get_hist_name(r_name, v_name)
+                    obj_name = self.get_object_name(i_name, h_name)
+
+                    obj_counter = ":".join([obj_name, "counter"])
+
+                    if not self.store.check(obj_counter):
+
+                        h = self.store.get(obj_name)
+
+                        if FN.fill_batch(self.store, h, r_name, [v_name], n):
+                            self.store.put(obj_counter, "done")
+
     def finalise(self, config):
         """Makes the plot."""
 
@@ -131,6 +131,28 @@ class Make1DProfilePlot(Algorithm):
 
                             self.store.put(obj_counter, "done")
 
+    def execute_batch(self, config, n):
+        """Fills graphs with a batch of events."""
+        i_name = self.store.get("INPUT:name")
+
+        for f_name, f_attr in config["folders"].items():
+            for v_name, v_attr in f_attr["variables"].items():
+                for r_name in self.make_regions_list(f_attr):
+
+                    g_name = self.get_graph_name(r_name, v_name)
+                    obj_name = self.get_object_name(i_name, g_name)
+
+                    obj_counter = ":".join([obj_name, "counter"])
+
+                    if not self.store.check(obj_counter):
+
+                        v_names = v_name.replace(" ", "").split(",")
+
+                        g = self.store.get(obj_name, "PERM")
+
+                        if FN.fill_batch(self.store, g, r_name, v_names, n):
+                            self.store.put(obj_counter, "done")
+
     def finalise(self, config):
         """Makes the plot."""
 
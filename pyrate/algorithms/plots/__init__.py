@@ -1,3 +1,12 @@
-from pyrate.algorithms.plots.Make1DHistPlot import Make1DHistPlot
-from pyrate.algorithms.plots.Make2DHistPlot import Make2DHistPlot
-from pyrate.algorithms.plots.Make1DProfilePlot import Make1DProfilePlot
+"""Plot algorithms. Algorithms are imported when first accessed."""
+
+from pyrate.utils.functions import lazy_getattr
+
+__getattr__ = lazy_getattr(
+    __name__,
+    [
+        "Make1DHistPlot",
+        "Make2DHistPlot",
+        "Make1DProfilePlot",
+    ],
+)
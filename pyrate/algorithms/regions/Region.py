@@ -19,9 +19,21 @@ is passed and a set of weights. The option is_subregion_of indicates whether the
 under consideration depends on other regions. Weight overlaps are checked and eliminated.
 """
 import sys
+import operator
+
+import numpy as np
 
 from pyrate.core.Algorithm import Algorithm
 
+_OPERATORS = {
+    ">=": operator.ge,
+    "<=": operator.le,
+    ">": operator.gt,
+    "<": operator.lt,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
 
 class Region(Algorithm):
     __slots__ = ()
@@ -105,6 +117,56 @@ class Region(Algorithm):
 
         self.store.put(config["name"], region)
 
+    def execute_batch(self, config, n):
+        """Computes region dictionary for a batch of events. The is_passed
+        item and the weights are columns."""
+
+        region = {"is_passed": np.ones(n, dtype=int), "weights": {}}
+
+        if "is_subregion_of" in config:
+            for s in config["is_subregion_of"]:
+                super_region = self.store.get(s)
+
+                region["is_passed"] *= super_region["is_passed"]
+
+                for w_name, w_value in super_region["weights"].items():
+
+                    if not w_name in region["weights"]:
+                        region["weights"][w_name] = w_value
+
+        if "selection" in config:
+            for and_s in config["selection"]:
+
+                OR = np.zeros(n, dtype=bool)
+
+                for or_s in and_s.split("||"):
+
+                    x, symbol, y = self.get_selection(or_s)
+
+                    OR |= _OPERATORS[symbol](self.get_operand(x), self.get_operand(y))
+
+                region["is_passed"] *= OR
+
+        if "weights" in config:
+            for w_name in config["weights"]:
+
+                if "=" in w_name:
+                    region["weights"][w_name] = np.full(
+                        n, float(w_name.split("=")[-1].replace(" ", ""))
+                    )
+
+                else:
+                    region["weights"][w_name] = self.store.get(w_name)
+
+        self.store.put(config["name"], region)
+
+    def get_operand(self, x):
+        """Returns a constant or the column of a variable."""
+        try:
+            return eval(x)
+        except NameError:
+            return np.asarray(self.store.get(x))
+
     def get_selection(self, selection):
         """Breaks down the selection criterion."""
         if " " in selection:
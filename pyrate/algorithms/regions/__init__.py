@@ -1 +1,10 @@
-from pyrate.algorithms.regions.Region import Region
+"""Region algorithms. Algorithms are imported when first accessed."""
+
+from pyrate.utils.functions import lazy_getattr
+
+__getattr__ = lazy_getattr(
+    __name__,
+    [
+        "Region",
+    ],
+)
@@ -63,7 +63,13 @@ class TreeMaker(Algorithm):
 
                 tree_dict[t_path].update({t_name: {"instance": None, "branches": {}}})
 
-                tree_dict[t_path][t_name]["instance"] = R.TTree(t_name, t_path_name)
+                # a resumed run continues filling the tree saved at the checkpoint.
+                t_saved = out_file.Get(t_name)
+
+                if t_saved:
+                    tree_dict[t_path][t_name]["instance"] = t_saved
+                else:
+                    tree_dict[t_path][t_name]["instance"] = R.TTree(t_name, t_path_name)
 
                 tree_dict[t_path][t_name]["instance"].SetMaxTreeSize((int(1 * MB)))
 
@@ -76,6 +82,10 @@ class TreeMaker(Algorithm):
 
                             tree_dict[t_path][t_name]["branches"][v_name] = b
 
+                            if t_saved:
+                                t_saved.SetBranchAddress(v_name, b)
+                                continue
+
                             b_instance = tree_dict[t_path][t_name]["instance"].Branch(
                                 v_name, b, f"{v_name}/{_T[v_type]['root']}"
                             )
@@ -94,6 +104,10 @@ class TreeMaker(Algorithm):
 
                             tree_dict[t_path][t_name]["branches"][v_name] = b
 
+                            if t_saved:
+                                t_saved.SetBranchAddress(v_name, b)
+                                continue
+
                             b_instance = tree_dict[t_path][t_name]["instance"].Branch(
                                 v_name, b
                             )
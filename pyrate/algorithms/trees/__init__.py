@@ -1 +1,10 @@
-from pyrate.algorithms.trees.TreeMaker import TreeMaker
+"""Tree algorithms. Algorithms are imported when first accessed."""
+
+from pyrate.utils.functions import lazy_getattr
+
+__getattr__ = lazy_getattr(
+    __name__,
+    [
+        "TreeMaker",
+    ],
+)
@@ -1,5 +1,6 @@
 """ Trigger requirements.
 """
+import numpy as np
 
 from pyrate.core.Algorithm import Algorithm
 
@@ -40,5 +41,24 @@ class Trigger(Algorithm):
 
         self.store.put(config["name"], time)
 
+    def execute_batch(self, config, n):
+
+        times = np.asarray(self.store.get(config["triggeredch"]))
+
+        if "get_diff" in config["algorithm"]:
+
+            # the first event of the batch is compared with the last one of the
+            # previous batch, kept on the permanent store as in the execute method.
+            previous_time = 0
+
+            if self.store.check(config["name"], "PERM"):
+                previous_time = self.store.get(config["name"], "PERM")
+
+            self.store.put(config["name"], times[-1], "PERM", replace=True)
+
+            times = times - np.concatenate(([previous_time], times[:-1]))
+
+        self.store.put(config["name"], times)
+
 
 # EOF
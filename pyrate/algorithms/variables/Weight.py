@@ -3,6 +3,8 @@
 import os
 from copy import copy
 
+import numpy as np
+
 from pyrate.core.Algorithm import Algorithm
 
 import ROOT as R
@@ -25,31 +27,7 @@ class Weight(Algorithm):
 
         elif "applycalib" in config:
 
-            h_calib = None
-
-            if not self.store.check(config["applycalib"]["histname"], "PERM"):
-                # if calibration histogram is not on the PERM store, need to open
-                # a calibration file, retrieve the histogram, and put it on the store.
-                # Note that this is an operation on the PERM store, so it will be
-                # executed only one time throughout the Run, even if this is the execute
-                # method of the Algorithm.
-                file_calib = R.TFile.Open(
-                    os.path.join(
-                        config["applycalib"]["filepath"],
-                        config["applycalib"]["filename"],
-                    )
-                )
-
-                # WARNING: we need to copy the histogram, as, when the file goes out of scope,
-                # the histogram will be deleted by ROOT!!!
-                h_calib = copy(file_calib.Get(config["applycalib"]["histname"]))
-
-                self.store.put(config["applycalib"]["histname"], h_calib, "PERM")
-                h_new = self.store.get(config["applycalib"]["histname"], "PERM")
-
-            else:
-                # if the calibration histogram already exist just retrieve it.
-                h_calib = self.store.get(config["applycalib"]["histname"], "PERM")
+            h_calib = self.get_calibration(config)
 
             # the calibration to choose will depend on the value of another variable
             # which we will retrieve from the TRAN store.
@@ -62,5 +40,49 @@ class Weight(Algorithm):
 
         self.store.put(config["name"], weight)
 
+    def execute_batch(self, config, n):
+
+        weights = np.ones(n)
+
+        if "value" in config:
+            weights = np.full(n, config["value"])
+
+        elif "applycalib" in config:
+
+            h_calib = self.get_calibration(config)
+
+            bin_values = self.store.get(config["applycalib"]["variable"]) / 10000
+
+            weights = np.array(
+                [h_calib.GetBinContent(h_calib.FindBin(b)) for b in bin_values]
+            )
+
+        self.store.put(config["name"], weights)
+
+    def get_calibration(self, config):
+        """Returns the calibration histogram."""
+
+        if not self.store.check(config["applycalib"]["histname"], "PERM"):
+            # if calibration histogram is not on the PERM store, need to open
+            # a calibration file, retrieve the histogram, and put it on the store.
+            # Note that this is an operation on the PERM store, so it will be
+            # executed only one time throughout the Run, even if this is the execute
+            # method of the Algorithm.
+            file_calib = R.TFile.Open(
+                os.path.join(
+                    config["applycalib"]["filepath"],
+                    config["applycalib"]["filename"],
+                )
+            )
+
+            # WARNING: we need to copy the histogram, as, when the file goes out of scope,
+            # the histogram will be deleted by ROOT!!!
+            h_calib = copy(file_calib.Get(config["applycalib"]["histname"]))
+
+            self.store.put(config["applycalib"]["histname"], h_calib, "PERM")
+
+        # if the calibration histogram already exist just retrieve it.
+        return self.store.get(config["applycalib"]["histname"], "PERM")
+
 
 # EOF
@@ -1,6 +1,15 @@
-from pyrate.algorithms.variables.Baseline import Baseline
-from pyrate.algorithms.variables.Charge import Charge
-from pyrate.algorithms.variables.Waveform import Waveform
-from pyrate.algorithms.variables.Weight import Weight
-from pyrate.algorithms.variables.Trigger import Trigger
-from pyrate.algorithms.variables.TestingReader import TestingReader
+"""Variable algorithms. Algorithms are imported when first accessed."""
+
+from pyrate.utils.functions import lazy_getattr
+
+__getattr__ = lazy_getattr(
+    __name__,
+    [
+        "Baseline",
+        "Charge",
+        "Waveform",
+        "Weight",
+        "Trigger",
+        "TestingReader",
+    ],
+)
@@ -36,6 +36,15 @@ class Algorithm:
         """
         self.store.put(config["name"], "PYRATE:none", "PERM")
 
+    def execute_batch(self, config, n):
+        """Override this method to process n events at once. Objects are retrieved
+        from the store as columns of n values, e.g. numpy arrays, and the object
+        config['name'] has to be put on the store as a column too. The inputs have
+        to be declared in the configuration. If any of the algorithms needed by a
+        target does not override this method, events are run one by one.
+        """
+        self.store.put(config["name"], "PYRATE:none", "TRAN")
+
     def _prepare_input(self, config, state):
         """Prepares objects on the store before the execution of the state methods.
         N.B.: config might not have a state and/or input fields defined. In this
@@ -80,5 +89,11 @@ class Algorithm:
 
         self._prepare_input(config, "finalise")
 
+    def _execute_batch(self, config, n):
+
+        self.store.put(config["name"], "PYRATE:none", "TRAN")
+
+        self._prepare_input(config, "execute")
+
 
 # EOF
@@ -5,26 +5,31 @@ to read from a database, synchronously or not, wrt to files.
 """
 import os
 import sys
+import bisect
+import importlib
+
+import numpy as np
 
 from pyrate.core.Reader import Reader
-from pyrate.readers.ReaderROOT import ReaderROOT
-#from pyrate.readers.ReaderWaveCatcherLC import ReaderWaveCatcherLC    # this reader is not the preferred one but we'll keep this line for reference.
-from pyrate.readers.ReaderWaveCatcherMMAP import ReaderWaveCatcherMMAP
-from pyrate.readers.ReaderBlueTongueMMAP import ReaderBlueTongueMMAP
-from pyrate.readers.ReaderWaveDumpMMAP import ReaderWaveDumpMMAP
-from pyrate.readers.ReaderPostgreSQL import ReaderPostgreSQL
 
 from pyrate.utils import functions as FN
 from pyrate.utils import strings as ST
+from pyrate.utils import index as IX
 
 GB = 1e9
 
+# first line of the ASCII files written by WaveCatcher.
+_WAVECATCHER_SIGNATURE = b"=== DATA FILE SAVED WITH SOFTWARE VERSION"
+
 
 class Input(Reader):
     def __init__(self, name, store, logger, iterable=(), **kwargs):
         super().__init__(name, store, logger)
         self.__dict__.update(iterable, **kwargs)
 
+        # lookups of INPUT: histograms in ROOT files, kept when the input is reloaded.
+        self._hists = {}
+
     def load(self):
 
         self.is_loaded = True
@@ -60,7 +65,14 @@ class Input(Reader):
                 if not isinstance(g_files, list):
                     g_files = [g_files]
 
-                self.groups[g_names[g_idx]] = g_files
+                if getattr(self, "chain", False):
+                    # all the files of the group are read by one reader.
+                    g_files = [tuple(g_files)]
+                    self._n_files = 1
+
+                # the list is copied as readers will replace the file names and
+                # the original input configuration has to stay reusable.
+                self.groups[g_names[g_idx]] = list(g_files)
                 self._set_group_reader(g_names[g_idx], self._f_idx)
 
         else:
@@ -78,7 +90,7 @@ class Input(Reader):
             for g_name, g_readers in self.groups.items():
                 for f_idx, reader in enumerate(g_readers):
 
-                    if isinstance(reader, str):
+                    if isinstance(reader, (str, tuple)):
                         continue
 
                     if reader.is_loaded:
@@ -100,7 +112,7 @@ class Input(Reader):
             if name.startswith("INPUT:"):
                 for f_idx, reader in enumerate(g_readers):
 
-                    if isinstance(reader, str):
+                    if isinstance(reader, (str, tuple)):
                         self._set_group_reader(g_name, f_idx)
 
                     g_readers[f_idx].read(name)
@@ -125,6 +137,82 @@ class Input(Reader):
         else:
             self._read_from_groups(name)
 
+    def set_event_names(self, names):
+        """Declares the EVENT: variables read by the job to the database and file
+        readers, including those which will be instantiated later."""
+        self._event_names = set(names)
+
+        if hasattr(self, "db"):
+            self.db.set_event_names(self._event_names)
+
+        if hasattr(self, "groups"):
+            for g_readers in self.groups.values():
+                for reader in g_readers:
+                    if not isinstance(reader, (str, tuple)):
+                        reader.set_event_names(self._event_names)
+
+    def get_column(self, name, n):
+        """Returns the values of an EVENT: variable for the next n events from the
+        current one, concatenated over the files or read from the database, or None
+        if its readers cannot read columns. The index of the input is not moved."""
+        if self._idx < 0 or n < 1:
+            return None
+
+        if "QUERY:" in name:
+            return self._get_db_column(name, n)
+
+        g_name = name.split(":")[2] if "GROUP:" in name else list(self.groups)[0]
+
+        columns, idx, f_idx = [], self._idx, self._f_idx
+
+        while idx < self._idx + n and f_idx < self._n_files:
+
+            self._set_group_reader(g_name, f_idx)
+
+            reader = self.groups[g_name][f_idx]
+
+            start = idx - self._f_offsets[f_idx]
+            stop = min(start + self._idx + n - idx, reader.get_n_events())
+
+            column = reader.get_column(name, start, stop)
+
+            if column is None:
+                return None
+
+            columns.append(column)
+
+            idx += stop - start
+            f_idx += 1
+
+        return columns[0] if len(columns) == 1 else np.concatenate(columns)
+
+    def _get_db_column(self, name, n):
+        """Returns the values of a database variable for the next n events. Rows
+        only follow the events if the input has no files."""
+        if hasattr(self, "groups"):
+            return None
+
+        idx = self.db.get_idx()
+
+        column = self.db.get_column(name, idx, idx + n)
+
+        if column is None or len(column) != n:
+            return None
+
+        return column
+
+    def get_reader_name(self, name):
+        """Returns the class name of the reader serving an object."""
+        if "QUERY:" in name:
+            return type(self.db).__name__
+
+        g_name = list(self.groups)[0]
+
+        if "GROUP:" in name:
+            g_name = name.split(":")[2]
+
+        return type(self.groups[g_name][self._f_idx]).__name__
+
     def set_n_events(self):
         """Reads number of events of the entire input."""
         if not self._n_events:
@@ -138,14 +226,16 @@ class Input(Reader):
             else:
                 self._n_events, g_n_events = 0, 0
 
+                # index of the first event of each file of the reference group.
+                self._f_offsets = []
+
                 for g_name, g_readers in self.groups.items():
                     for f_idx, reader in enumerate(g_readers):
 
-                        if isinstance(reader, str):
-                            self._set_group_reader(g_name, f_idx)
+                        if not g_n_events:
+                            self._f_offsets.append(self._n_events)
 
-                        f_n_events = g_readers[f_idx].get_n_events()
-                        self._n_events += f_n_events
+                        self._n_events += self._get_file_n_events(g_name, f_idx)
 
                     if not g_n_events:
                         g_n_events = self._n_events
@@ -158,10 +248,42 @@ class Input(Reader):
                     self._n_events = 0
                 self._n_events = g_n_events
 
+    def _get_file_n_events(self, g_name, f_idx):
+        """Returns the number of events of a file of a group. For files without a
+        reader the number is taken from the index of the file, see pyrate.utils.index,
+        so that the file is not opened after the first time."""
+        f_name = self.groups[g_name][f_idx]
+
+        if isinstance(f_name, tuple):
+            self._set_group_reader(g_name, f_idx)
+
+        if not isinstance(self.groups[g_name][f_idx], str):
+            return self.groups[g_name][f_idx].get_n_events()
+
+        return IX.get_n_events(f_name, lambda: self._count_events(g_name, f_idx))
+
+    def _count_events(self, g_name, f_idx):
+        """Counts the events of a file with its reader, which is offloaded after."""
+        f_name = self.groups[g_name][f_idx]
+
+        self._set_group_reader(g_name, f_idx)
+
+        reader = self.groups[g_name][f_idx]
+
+        n_events = reader.get_n_events()
+
+        reader.offload()
+
+        self.groups[g_name][f_idx] = f_name
+
+        return n_events
+
     def set_idx(self, idx):
         """Setting the event index of the global input reader to a specific value.
-        This operation requires moving/jumping to specific file readers which might
-        have not been initialised yet.
+        The file containing the event is found with a binary search on the cumulative
+        number of events of the files, so that the index can be moved in both directions.
+        This operation requires jumping to file readers which might have not been
+        initialised yet.
         """
 
         if not self._n_events:
@@ -170,8 +292,10 @@ class Input(Reader):
         if hasattr(self, "db") and not hasattr(self, "groups"):
             self.db.set_idx(idx)
 
+            self._idx = self.db.get_idx()
+
         else:
-            if idx > self._n_events - 1:
+            if not 0 <= idx <= self._n_events - 1:
                 # ----------------------------------------
                 # Don't move outside boundaries
                 # ----------------------------------------
@@ -179,62 +303,18 @@ class Input(Reader):
                 self._idx = -1
                 return
 
-            else:
-                # use a generic group to pick up a reference reader.
-                g = self.groups[list(self.groups)[0]]
-
-                if idx > self._idx:
-                    # ----------------------------------------
-                    # Moving forward
-                    # ----------------------------------------
-                    verse = "frw"
-
-                    while (idx - self._idx) > (
-                        g[self._f_idx].get_n_events() - 1 - g[self._f_idx].get_idx()
-                    ):
-                        if self._move_readers(verse) > -1:
-
-                            # increment global index to match last index of previous file.
-                            self._idx += (
-                                g[self._f_idx - 1].get_n_events()
-                                - 1
-                                - g[self._f_idx - 1].get_idx()
-                            )
-
-                            for g_name, g_readers in self.groups.items():
-                                g_readers[self._f_idx].set_idx(0)
+            f_idx = bisect.bisect_right(self._f_offsets, idx) - 1
 
-                            self._idx += 1
+            if f_idx != self._f_idx:
+                self._f_idx = f_idx
 
-                        else:
-                            self._idx = -1
-                            return
-
-                    if (idx - self._idx) <= (
-                        g[self._f_idx].get_n_events() - 1 - g[self._f_idx].get_idx()
-                    ):
-                        increment = g[self._f_idx].get_idx() + (idx - self._idx)
-
-                        for g_name, g_readers in self.groups.items():
-                            g_readers[self._f_idx].set_idx(increment)
-
-                        self._idx = idx
-                        return
+                for g_name in self.groups:
+                    self._set_group_reader(g_name, self._f_idx)
 
-                elif idx < self._idx:
-                    # ----------------------------------------
-                    # Moving backwards
-                    # ----------------------------------------
-                    verse = "bkw"
-                    sys.exit(
-                        f"ERROR: supporting moving the event index backward is still not supported!"
-                    )
+            for g_name, g_readers in self.groups.items():
+                g_readers[self._f_idx].set_idx(idx - self._f_offsets[self._f_idx])
 
-                else:
-                    # ----------------------------------------
-                    # Don't move
-                    # ----------------------------------------
-                    return self._idx
+            self._idx = idx
 
     def set_next_event(self):
         """Move to the next event in the sequence."""
@@ -251,6 +331,10 @@ class Input(Reader):
                         return self._idx
 
                     else:
+                        # readers might have been left elsewhere by set_idx.
+                        for readers in self.groups.values():
+                            readers[self._f_idx].set_idx(0)
+
                         self._idx += 1
                         return self._idx
 
@@ -294,46 +378,104 @@ class Input(Reader):
         """Instantiates the reader for the database."""
         r_name = "_".join([self.name, db["connection"]["dbname"]])
 
-        self.db = ReaderPostgreSQL(r_name, self.store, self.logger, db)
+        self.db = get_reader("ReaderPostgreSQL")(r_name, self.store, self.logger, db)
 
         self.db.load()
 
     def _set_group_reader(self, g_name, f_idx):
         """Instantiate different readers here. If the instance exists nothing
-        is done. This function transforms a string into a reader.
+        is done. This function transforms a string into a reader, or a tuple
+        of ROOT files into a reader of their chain.
         """
-        if isinstance(self.groups[g_name][f_idx], str):
+        if isinstance(self.groups[g_name][f_idx], (str, tuple)):
 
             r_name = "_".join([g_name, str(f_idx)])
 
             f_name = self.groups[g_name][f_idx]
 
-            if f_name.endswith(".root"):
-                reader = ReaderROOT(
-                    r_name, self.store, self.logger, f_name, self.structure
+            if isinstance(f_name, tuple):
+                reader = get_reader("ReaderROOTChain")(
+                    r_name,
+                    self.store,
+                    self.logger,
+                    f_name,
+                    self.structure,
+                    cache=self._hists,
                 )
 
+            elif f_name.endswith(".root"):
+
+                if getattr(self, "backend", None) == "uproot":
+                    reader = get_reader("ReaderUproot")(
+                        r_name, self.store, self.logger, f_name, self.structure
+                    )
+
+                else:
+                    reader = get_reader("ReaderROOT")(
+                        r_name,
+                        self.store,
+                        self.logger,
+                        f_name,
+                        self.structure,
+                        cache=self._hists,
+                    )
+
             elif f_name.endswith(".dat"):
-                # choose the reader based on file size.
+                # choose the reader based on file name and content.
 
                 if "sabre" in os.path.basename(f_name):
-                    reader = ReaderBlueTongueMMAP(
+                    reader = get_reader("ReaderBlueTongueMMAP")(
+                        r_name, self.store, self.logger, f_name, self.structure
+                    )
+
+                elif is_wavedump_binary(f_name):
+                    reader = get_reader("ReaderWaveDumpBinary")(
                         r_name, self.store, self.logger, f_name, self.structure
                     )
 
                 else:
-                    reader = ReaderWaveCatcherMMAP(
+                    reader = get_reader("ReaderWaveCatcherMMAP")(
                         r_name, self.store, self.logger, f_name, self.structure
                     )
 
             elif f_name.endswith(".txt"):
-                reader = ReaderWaveDumpMMAP(
+                reader = get_reader("ReaderWaveDumpMMAP")(
                     r_name, self.store, self.logger, f_name, self.structure
                 )
 
             reader.load()
 
+            if hasattr(self, "_event_names"):
+                reader.set_event_names(self._event_names)
+
             self.groups[g_name][f_idx] = reader
 
 
+def is_wavedump_binary(f_name):
+    """Checks if a .dat file is a binary WaveDump file rather than a WaveCatcher one.
+    WaveCatcher files are ASCII and start with their signature. Binary WaveDump files
+    start with the size of their first event, which is checked alone, so that files
+    truncated while being written are still recognised."""
+    with open(f_name, "rb") as f:
+        head = f.read(len(_WAVECATCHER_SIGNATURE))
+
+    if head.startswith(_WAVECATCHER_SIGNATURE) or len(head) < 24:
+        return False
+
+    # the event size includes a header of six 32-bit words and 16-bit samples.
+    size = int.from_bytes(head[:4], "little")
+
+    return 24 <= size <= os.path.getsize(f_name) and size % 2 == 0
+
+
+def get_reader(r_class):
+    """Imports a reader backend, and its dependencies, e.g. ROOT or psycopg2, only when
+    a file or database of its type is opened."""
+    try:
+        return getattr(importlib.import_module(f"pyrate.readers.{r_class}"), r_class)
+
+    except ImportError as error:
+        sys.exit(f"ERROR: reader {r_class} is not available. {error}")
+
+
 # EOF
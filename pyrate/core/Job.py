@@ -5,7 +5,6 @@ instances of a Run homogeneous in purpose and structure.
 import os
 import sys
 import yaml
-import pyclbr
 import logging
 
 from itertools import groupby
@@ -14,6 +13,7 @@ from pyrate.utils import strings as ST
 from pyrate.utils import functions as FN
 
 from pyrate.core.Run import Run
+from pyrate.core.Registry import Registry
 
 
 class Job:
@@ -29,6 +29,13 @@ class Job:
 
         self.job = {
             "no_progress_bar": self.config["no_progress_bar"],
+            "workers": self.config.get("workers", 1),
+            "parallel_inputs": self.config.get("parallel_inputs", False),
+            "batch_size": self.config.get("batch_size", 0),
+            "timing": self.config.get("timing", False),
+            "prefetch": self.config.get("prefetch", {}),
+            "checkpoint": self.config.get("checkpoint", {}),
+            "resume": self.config.get("resume", False),
             "logger": None,
             "inputs": {},
             "configs": {},
@@ -42,6 +49,13 @@ class Job:
         self.job["logger"] = logging.getLogger("pyrate")
         self.job["logger"].setLevel(getattr(logging, self.log_level))
 
+        # --------------------------
+        # Setup the algorithm registry
+        # --------------------------
+
+        self.job["registry"] = Registry(self.name, self.job["logger"])
+        self.job["registry"].load()
+
         # --------------------------
         # Build global configuration
         # --------------------------
@@ -239,57 +253,54 @@ class Job:
         if not FN.check("name", obj_conf["algorithm"]):
             sys.exit(f"ERROR: please specify  algorithm name for object {obj_name}!")
 
-        pyrate_modules = [m for m in sys.modules if "pyrate" in m]
-
         n_alg_definitions = 0
 
         alg_name = obj_conf["algorithm"]["name"]
 
         states = ["initialise", "execute", "finalise"]
 
-        for m in pyrate_modules:
-            if alg_name == m.split(".")[-1]:
+        for m in self.job["registry"].get_modules(alg_name):
 
-                n_alg_definitions += 1
+            n_alg_definitions += 1
 
-                # Check 4
-                if not alg_name in pyclbr.readmodule(f"{m}").keys():
+            alg_methods = self.job["registry"].get_methods(m, alg_name)
 
-                    sys.exit(
-                        f"ERROR: module {m} has to contain an algorithm called {alg_name}!"
-                    )
+            # Check 4
+            if alg_methods is None:
 
-                alg_methods = pyclbr.readmodule(f"{m}")[alg_name].__dict__["children"]
+                sys.exit(
+                    f"ERROR: module {m} has to contain an algorithm called {alg_name}!"
+                )
 
-                # some algorithms might simply want to reimplement
-                # the internal methods to prepare the input, so the underscore
-                # has to be replaced (see Algorithm definition).
-                alg_methods = [a.replace("_", "") for a in alg_methods]
+            # some algorithms might simply want to reimplement
+            # the internal methods to prepare the input, so the underscore
+            # has to be replaced (see Algorithm definition).
+            alg_methods = [a.replace("_", "") for a in alg_methods]
 
-                alg_states = set([s for s in alg_methods if s in states])
+            alg_states = set([s for s in alg_methods if s in states])
 
-                conf_states = set([s for s in states if FN.check(s, obj_conf)])
+            conf_states = set([s for s in states if FN.check(s, obj_conf)])
 
-                # Check 5
-                if not alg_states == conf_states:
+            # Check 5
+            if not alg_states == conf_states:
+                sys.exit(
+                    f"ERROR: states mismatch b/w object {obj_name} and algorithm {alg_name}!"
+                )
+
+            # Check 6
+            for s in conf_states:
+                if not (
+                    FN.check("input", obj_conf[s])
+                    or FN.check("output", obj_conf[s])
+                ):
                     sys.exit(
-                        f"ERROR: states mismatch b/w object {obj_name} and algorithm {alg_name}!"
+                        f"ERROR: state {s} for object {obj_name} has no input or output fields defined!\nPlease add at least one of the fields"
                     )
 
-                # Check 6
-                for s in conf_states:
-                    if not (
-                        FN.check("input", obj_conf[s])
-                        or FN.check("output", obj_conf[s])
-                    ):
-                        sys.exit(
-                            f"ERROR: state {s} for object {obj_name} has no input or output fields defined!\nPlease add at least one of the fields"
-                        )
-
         # Check 3
         if n_alg_definitions == 0:
             e_msg = f"ERROR: while checking the configuration for {obj_name}, no suitable {alg_name} module has been found!\n"
-            e_msg += "1) The algorithm / module has to be added to its local __init__.py file.\n"
+            e_msg += "1) The module has to be placed under pyrate/algorithms or imported before the job is set up.\n"
             e_msg += "2) Make sure the name of the algorithm is written correctly.\n"
             e_msg += "3) The module and the algorithm have to have the same name.\n"
             sys.exit(e_msg)
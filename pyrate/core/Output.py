@@ -1,9 +1,10 @@
 """ Output base class. 
 """
 import os
+import sys
+import importlib
 
 from pyrate.core.Writer import Writer
-from pyrate.writers.WriterROOT import WriterROOT
 
 from pyrate.utils import functions as FN
 from pyrate.utils import strings as ST
@@ -41,8 +42,19 @@ class Output(Writer):
 
             f = os.path.join(f_path, f_name)
 
+            # a resumed run keeps what was written before the checkpoint.
+            mode = "UPDATE" if getattr(self, "resume", False) else "RECREATE"
+
             if f.endswith(".root"):
-                writer = WriterROOT(w_name, self.store, self.logger, f, w_targets)
+                writer = get_writer("WriterROOT")(
+                    w_name, self.store, self.logger, f, w_targets, mode=mode
+                )
+                self.writers[w_name] = writer
+
+            elif f.endswith(".npz"):
+                writer = get_writer("WriterNPZ")(
+                    w_name, self.store, self.logger, f, w_targets, mode=mode
+                )
                 self.writers[w_name] = writer
 
             elif f.endswith(".dat"):
@@ -51,4 +63,14 @@ class Output(Writer):
             writer.load()
 
 
+def get_writer(w_class):
+    """Imports a writer backend, and its dependencies, only when an output of its type is
+    requested."""
+    try:
+        return getattr(importlib.import_module(f"pyrate.writers.{w_class}"), w_class)
+
+    except ImportError as error:
+        sys.exit(f"ERROR: writer {w_class} is not available. {error}")
+
+
 # EOF
@@ -0,0 +1,139 @@
+""" Prefetcher class. It reads event variables ahead of the event loop on a
+background thread or process. The prefetcher opens its own instance of the
+input, with a private store, so that the readers used by the event loop are
+not shared. Values are handed over through a queue holding at most depth events.
+On a thread, values are copied before being queued, as readers can reuse their
+buffers for the next event.
+"""
+import sys
+import queue
+import threading
+import multiprocessing
+
+from pyrate.core.Input import Input
+from pyrate.core.Store import Store
+
+from pyrate.utils import functions as FN
+
+_STOP = "PYRATE:stop"
+
+
+class Prefetcher:
+    __slots__ = [
+        "name",
+        "logger",
+        "names",
+        "depth",
+        "mode",
+        "_run",
+        "_config",
+        "_queue",
+        "_stop",
+        "_worker",
+    ]
+
+    def __init__(self, name, run, config, names, depth=64, mode="thread"):
+        self.name = name
+        self.logger = run.logger
+        self.names = list(names)
+        self.depth = depth
+        self.mode = mode
+        self._run = run
+        self._config = config
+        self._queue = None
+        self._stop = None
+        self._worker = None
+
+    def start(self, emin, emax):
+        """Starts reading events from emin to emax included."""
+
+        # daemonic processes, e.g. the event slice workers, cannot have children.
+        if self.mode == "process" and not multiprocessing.current_process().daemon:
+            context = multiprocessing.get_context("fork")
+
+            self._queue = context.Queue(self.depth)
+            self._stop = context.Event()
+            self._worker = context.Process(target=self._produce, args=(emin, emax))
+
+        else:
+            self._queue = queue.Queue(self.depth)
+            self._stop = threading.Event()
+            self._worker = threading.Thread(target=self._produce, args=(emin, emax))
+
+        self._worker.daemon = True
+        self._worker.start()
+
+    def stop(self):
+        """Stops the background reader."""
+        self._stop.set()
+
+        if isinstance(self._worker, threading.Thread):
+            # make room in the queue in case the reader is waiting.
+            while self._worker.is_alive():
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    pass
+                self._worker.join(0.01)
+
+        else:
+            self._worker.terminate()
+            self._worker.join()
+
+    def get(self):
+        """Returns the index and values of the next event."""
+        item = self._queue.get()
+
+        if item[0] == _STOP:
+            sys.exit(f"ERROR: prefetching of {self.name} has failed. {item[1]}")
+
+        return item
+
+    def _produce(self, emin, emax):
+        """Reads events and puts their values in the queue."""
+        try:
+            # values sent to a process are copied by the queue.
+            is_thread = isinstance(self._worker, threading.Thread)
+
+            store = Store(self._run)
+
+            i = Input(self.name, store, self.logger, self._config)
+            i.load()
+            i.set_event_names(self.names)
+            i.set_idx(emin)
+
+            for idx in range(emin, emax + 1):
+
+                for name in self.names:
+                    i.read(name)
+
+                values = {
+                    n: store.get(n, "TRAN") for n in self.names if store.check(n, "TRAN")
+                }
+
+                if is_thread:
+                    values = {n: FN.copy_value(v) for n, v in values.items()}
+
+                item = (i.get_idx(), values)
+
+                while not self._stop.is_set():
+                    try:
+                        self._queue.put(item, timeout=0.1)
+                        break
+                    except queue.Full:
+                        pass
+
+                if self._stop.is_set():
+                    break
+
+                store.advance()
+
+                i.set_next_event()
+
+            i.offload()
+
+        except Exception as error:
+            self._queue.put((_STOP, repr(error)))
+
+
+# EOF
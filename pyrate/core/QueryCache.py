@@ -0,0 +1,164 @@
+""" QueryCache class. It keeps the results of database queries, identified by
+the connection and the normalised query text, in memory and optionally on disk,
+as pickle files in a folder. Results older than ttl seconds are not used and at
+most size results are kept, the least recently used being evicted first.
+Results are copied in and out of the cache, so that changing a result does
+not change the cached one.
+"""
+import os
+import time
+import pickle
+import hashlib
+from copy import deepcopy
+from collections import OrderedDict
+
+
+class QueryCache:
+    __slots__ = [
+        "name",
+        "logger",
+        "ttl",
+        "size",
+        "path",
+        "_results",
+        "_n_files",
+        "_evicted",
+    ]
+
+    def __init__(self, name, logger, ttl=None, size=1000, path=None):
+        self.name = name
+        self.logger = logger
+        self.ttl = ttl
+        self.size = size
+        self.path = path
+        self._results = OrderedDict()
+
+        # files on disk, counted when evicting and then incremented when saving.
+        self._n_files = None
+        self._evicted = 0
+
+        if self.path:
+            os.makedirs(self.path, exist_ok=True)
+
+    @staticmethod
+    def get_key(connection, query):
+        """Returns the key of a query, ignoring differences in whitespace."""
+        query = " ".join(query.split()).rstrip(";").strip()
+
+        return hashlib.sha256(f"{connection}\n{query}".encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Returns a tuple (found, result) for key."""
+        if not key in self._results and self.path:
+            self._load(key)
+
+        if key in self._results:
+            t, result = self._results[key]
+
+            if self.ttl is None or time.time() - t < self.ttl:
+                self._results.move_to_end(key)
+                return True, deepcopy(result)
+
+            self._results.pop(key)
+
+        return False, None
+
+    def put(self, key, result):
+        """Adds a result, evicting the least recently used ones beyond size."""
+        self._results[key] = (time.time(), deepcopy(result))
+
+        self._trim()
+
+        if self.path:
+            self._save(key)
+
+            if self._is_full():
+                self._evict()
+
+    def _trim(self):
+        """Removes the least recently used results in memory beyond size."""
+        while len(self._results) > self.size:
+            self._results.popitem(last=False)
+
+    def _load(self, key):
+        """Loads a result from the disk, if present."""
+        f_name = os.path.join(self.path, key + ".pkl")
+
+        try:
+            with open(f_name, "rb") as f:
+                self._results[key] = pickle.load(f)
+
+            self._trim()
+
+            # the modification time marks the last use of the file.
+            os.utime(f_name)
+
+        except (OSError, pickle.UnpicklingError, EOFError):
+            pass
+
+    def _save(self, key):
+        """Saves a result to the disk. Files are written atomically, as the
+        folder can be shared by jobs running at the same time."""
+        f_name = os.path.join(self.path, key + ".pkl")
+        tmp_name = f"{f_name}.{os.getpid()}"
+
+        try:
+            with open(tmp_name, "wb") as f:
+                pickle.dump(self._results[key], f)
+
+            os.replace(tmp_name, f_name)
+
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            self.logger.warning(f"query result cannot be cached in {self.path}")
+
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
+
+    def _is_full(self):
+        """Checks if the files on disk should be evicted, i.e. if there are more
+        than size of them or if they have not been checked for ttl seconds. The
+        folder is listed the first time only, as it can be large."""
+        if self._n_files is None:
+            return True
+
+        self._n_files += 1
+
+        if self.ttl is not None and time.time() - self._evicted >= self.ttl:
+            return True
+
+        return self._n_files > self.size
+
+    def _evict(self):
+        """Removes the least recently used results on disk beyond size and those
+        not used for longer than ttl. A tenth of size is removed in addition when
+        there are too many results, so that the folder is not listed again at
+        each result saved."""
+        files, now = [], time.time()
+
+        for f_name in os.listdir(self.path):
+            if f_name.endswith(".pkl"):
+                f_name = os.path.join(self.path, f_name)
+
+                try:
+                    files.append((os.path.getmtime(f_name), f_name))
+                except OSError:
+                    pass
+
+        # the most recently used files come first.
+        files.sort(reverse=True)
+
+        size = self.size - self.size // 10 if len(files) > self.size else self.size
+
+        self._n_files, self._evicted = 0, now
+
+        for idx, (mtime, f_name) in enumerate(files):
+            if idx >= size or (self.ttl is not None and now - mtime >= self.ttl):
+                try:
+                    os.remove(f_name)
+                except OSError:
+                    pass
+            else:
+                self._n_files += 1
+
+
+# EOF
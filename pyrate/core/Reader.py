@@ -3,7 +3,7 @@
 
 
 class Reader:
-    __slots__ = ["name", "store", "logger", "is_loaded", "_idx", "_n_events"]
+    __slots__ = ["name", "store", "logger", "is_loaded", "_idx", "_n_events", "_headers"]
 
     def __init__(self, name, store, logger):
         self.name = name
@@ -12,6 +12,7 @@ class Reader:
         self.is_loaded = False
         self._idx = 0
         self._n_events = None
+        self._headers = {}
 
     def load(self):
         """Initialises reader condition members and puts it in a 'read ready' condition."""
@@ -33,6 +34,28 @@ class Reader:
         elif name.startswith("INPUT:"):
             pass
 
+    def read_header(self, name):
+        """Puts a header variable on the transient store. The value is read from
+        the file the first time only and then served from memory."""
+        if not name in self._headers:
+            self._headers[name] = self._get_header(name)
+
+        self.store.put(name, self._headers[name], "TRAN")
+
+    def _get_header(self, name):
+        """Reads a header variable from the file and returns its value."""
+        pass
+
+    def set_event_names(self, names):
+        """Declares the EVENT: variables read by the job, so that the reader
+        can restrict reading to them. Other variables can still be read."""
+        pass
+
+    def get_column(self, name, start, stop):
+        """Returns the values of an EVENT: variable for the events from start to stop
+        excluded, as a NumPy array, or None if the reader cannot read columns."""
+        return None
+
     def get_idx(self):
         """Gets index of current event. """
         return self._idx
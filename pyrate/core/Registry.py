@@ -0,0 +1,170 @@
+""" Registry class. It maps the name of each algorithm to the module defining it,
+without importing the module. Algorithms are found in the source files of the
+algorithm packages: the module and the algorithm class have the same name.
+The map, with the methods implemented by each algorithm, is cached on disk and
+rebuilt only when the files of the packages change. Modules are imported when
+an algorithm is first requested. Algorithm modules imported by the user before
+the job is set up are also considered.
+"""
+import os
+import sys
+import ast
+import json
+import importlib
+import importlib.util
+
+_PACKAGES = ["pyrate.algorithms"]
+
+_CACHE = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+    "pyrate",
+    "registry.json",
+)
+
+
+class Registry:
+    __slots__ = ["name", "logger", "packages", "cache", "_algorithms", "_loaded"]
+
+    def __init__(self, name, logger, packages=None, cache=_CACHE):
+        self.name = name
+        self.logger = logger
+        self.packages = packages or _PACKAGES
+        self.cache = cache
+        self._algorithms = {}
+        self._loaded = {}
+
+    def load(self):
+        """Reads the map from the cache or builds it if the packages have changed."""
+
+        paths = {p: self.get_package_path(p) for p in self.packages}
+
+        key = {p: [path, self.get_mtime(path)] for p, path in paths.items()}
+
+        if os.path.exists(self.cache):
+            try:
+                with open(self.cache, "r") as f:
+                    cache = json.load(f)
+
+                if cache["key"] == key:
+                    self._algorithms = cache["algorithms"]
+                    return
+
+            except (OSError, ValueError, KeyError):
+                pass
+
+        self._algorithms = {}
+
+        for p, path in paths.items():
+            self.scan(p, path)
+
+        try:
+            os.makedirs(os.path.dirname(self.cache), exist_ok=True)
+
+            with open(f"{self.cache}.{os.getpid()}", "w") as f:
+                json.dump({"key": key, "algorithms": self._algorithms}, f)
+
+            os.replace(f"{self.cache}.{os.getpid()}", self.cache)
+
+        except OSError:
+            self.logger.warning(f"algorithm registry cannot be cached in {self.cache}")
+
+    def scan(self, package, path):
+        """Registers the modules found under the path of the package."""
+
+        for d_path, d_names, f_names in os.walk(path):
+
+            d_names[:] = sorted(d for d in d_names if not d.startswith("__"))
+
+            m_path = os.path.relpath(d_path, path).replace(os.sep, ".")
+
+            for f_name in sorted(f_names):
+
+                if not f_name.endswith(".py") or f_name.startswith("__"):
+                    continue
+
+                alg_name = f_name[: -len(".py")]
+
+                module = ".".join(
+                    [package] + ([m_path] if m_path != "." else []) + [alg_name]
+                )
+
+                self._algorithms.setdefault(alg_name, {})[module] = self.read_methods(
+                    os.path.join(d_path, f_name), alg_name
+                )
+
+    def get_modules(self, alg_name):
+        """Returns the modules defining an algorithm."""
+
+        modules = list(self._algorithms.get(alg_name, {}))
+
+        # modules imported by the user, e.g. algorithms outside the pyrate package.
+        modules.extend(
+            m
+            for m in sys.modules
+            if "pyrate" in m and m.split(".")[-1] == alg_name and not m in modules
+        )
+
+        return modules
+
+    def get_methods(self, module, alg_name):
+        """Returns the methods implemented by the algorithm class of a module,
+        or None if the module does not define it."""
+
+        if module in self._algorithms.get(alg_name, {}):
+            return self._algorithms[alg_name][module]
+
+        return self.read_methods(sys.modules[module].__file__, alg_name)
+
+    def get_algorithm(self, alg_name):
+        """Imports the module of an algorithm and returns the algorithm class."""
+
+        if not alg_name in self._loaded:
+
+            modules = self.get_modules(alg_name)
+
+            if not modules:
+                sys.exit(f"ERROR: no module found for algorithm {alg_name}!")
+
+            self._loaded[alg_name] = getattr(
+                importlib.import_module(modules[0]), alg_name
+            )
+
+        return self._loaded[alg_name]
+
+    @staticmethod
+    def read_methods(f_name, alg_name):
+        """Parses a source file and returns the methods of the class alg_name."""
+
+        with open(f_name, "r") as f:
+            tree = ast.parse(f.read(), f_name)
+
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef) and node.name == alg_name:
+                return [
+                    n.name
+                    for n in node.body
+                    if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))
+                ]
+
+        return None
+
+    @staticmethod
+    def get_package_path(package):
+        """Returns the directory of a package without importing it."""
+        return importlib.util.find_spec(package).submodule_search_locations[0]
+
+    @staticmethod
+    def get_mtime(path):
+        """Returns the latest modification time of the files and folders under path."""
+
+        mtime = os.stat(path).st_mtime
+
+        for d_path, d_names, f_names in os.walk(path):
+            for n in d_names + f_names:
+                if n.endswith(".py") or not "." in n:
+                    mtime = max(mtime, os.stat(os.path.join(d_path, n)).st_mtime)
+
+        return mtime
+
+
+# EOF
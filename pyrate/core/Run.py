@@ -1,22 +1,36 @@
 """ This class controls the execution of algorithms
     as a single local instance. 
 """
+import os
 import sys
-import importlib
+import pickle
+import multiprocessing
 import timeit
 import time
 import logging
 
+import numpy as np
 from colorama import Fore
 from tqdm import tqdm
 
+from pyrate.core.Algorithm import Algorithm
 from pyrate.core.Store import Store
 from pyrate.core.Input import Input
 from pyrate.core.Output import Output
+from pyrate.core.Prefetcher import Prefetcher
+from pyrate.core.Timer import Timer
 
 from pyrate.utils import strings as ST
 from pyrate.utils import functions as FN
 
+# objects inherited by forked worker processes.
+_FORKED = {}
+
+
+def _execute_worker(task):
+    """Entry point of the worker processes."""
+    return _FORKED["run"].execute_worker(_FORKED["store"], *task)
+
 
 class Run:
     def __init__(self, name, iterable=(), **kwargs):
@@ -74,13 +88,33 @@ class Run:
 
         store = Store(self)
 
+        self._timer = None
+        self._learned = None
+        self._batch_names = None
+
+        if self.timing:
+            self._timer = Timer(self.name, self.logger)
+
+        self._resume = None
+        self._inputs_done = []
+        self._checkpoint_file = None
+
+        if self.checkpoint or self.resume:
+            self.load_checkpoint()
+
         store.put("history", self._history, "PERM")
 
         # -----------------------------------------------------------------------
         # Instanciate/load the output. Files are opened and ready to be written.
         # -----------------------------------------------------------------------
 
-        self._out = Output(self.name, store, self.logger, outputs=self.outputs)
+        self._out = Output(
+            self.name,
+            store,
+            self.logger,
+            outputs=self.outputs,
+            resume=bool(self._resume),
+        )
 
         if not self._out.is_loaded:
             self._out.load()
@@ -96,6 +130,7 @@ class Run:
         # -----------------------------------------------------------------------
 
         self.algorithms = {}
+        self._plans = {}
         for i_name, targets in all_inputs_vs_targets.items():
             for t in targets:
                 alg_name = self._config[t["object"]]["algorithm"]["name"]
@@ -115,6 +150,9 @@ class Run:
 
         for state in ["initialise", "execute", "finalise"]:
 
+            if state == "execute" and self._resume:
+                self.restore_checkpoint(store)
+
             # updating list of targets to be considered for the next loop.
             current_inputs_vs_targets = self.update_inputs_vs_targets(
                 state, store, all_inputs_vs_targets
@@ -130,6 +168,17 @@ class Run:
         if self.no_progress_bar:
             print("Execution time: ", str(stop - start))
 
+        if self._checkpoint_file and os.path.exists(self._checkpoint_file):
+            os.remove(self._checkpoint_file)
+
+        if self._timer:
+            t_name = f"{self.name}.{time.strftime('%Y-%m-%d-%Hh%M')}.timing"
+
+            self._timer.write(t_name)
+            self._timer.log()
+
+            print(f"Timing report written to {t_name}.json/.csv")
+
         # self.logger.info("Execution time: ", str(stop - start))
 
         return store
@@ -145,10 +194,26 @@ class Run:
 
         self.state = state
 
+        store.set_state(state)
+
         prefix = prefix_types[state]
 
         info = self.state.rjust(70, ".")
 
+        if (
+            self.state == "execute"
+            and self.workers > 1
+            and self.parallel_inputs
+            and self.can_fork(store)
+        ):
+            # ---------------------------------------------------------------
+            # Inputs share no transient objects in the execute loop so they
+            # can be processed at the same time.
+            # ---------------------------------------------------------------
+            self.run_inputs(store, inputs_vs_targets, prefix)
+
+            return store
+
         for i_name, targets in tqdm(
             inputs_vs_targets.items(),
             desc=f"{prefix}{info}",
@@ -188,44 +253,28 @@ class Run:
                 # Execute loop
                 # ---------------------------------------------------------------
 
+                self._in.set_event_names(self.get_event_names(store, targets))
+
                 tot_n_events = self._in.get_n_events()
 
                 eslices = self.get_events_slices(tot_n_events)
 
-                # ---------------------------------------------------------------
-                # Event loop
-                # ---------------------------------------------------------------
-
-                for emin, emax in eslices:
-
-                    info = (
-                        f"{self.state} ({i_name},  emin: {emin},  emax: {emax})".rjust(
-                            70, "."
-                        )
-                    )
-
-                    self._in.set_idx(emin)
-
-                    erange = emax - emin + 1
-
-                    for idx in tqdm(
-                        range(erange),
-                        desc=f"{prefix}{info}",
-                        disable=self.no_progress_bar,
-                        bar_format=self.colors[self.state]["event"],
-                    ):
-                        store.put("INPUT:name", i_name, "TRAN")
-                        store.put("INPUT:config", self.inputs[i_name], "TRAN")
-                        store.put("EVENT:idx", self._in.get_idx())
+                if self._resume:
+                    eslices = self.resume_events_slices(i_name, eslices)
 
-                        self.loop(store, targets)
+                if self.workers > 1 and self.can_fork(store):
+                    self.run_workers(store, i_name, targets, eslices, prefix)
 
-                        store.clear("TRAN")
-
-                        self._in.set_next_event()
+                else:
+                    for emin, emax in eslices:
+                        self.run_slice(store, i_name, targets, emin, emax, prefix)
 
                 self._in.offload()
 
+                if self.checkpoint:
+                    self._inputs_done.append(i_name)
+                    self.write_checkpoint(store, None, 0)
+
         if self.state == "finalise":
             # ---------------------------------------------------------------
             # Write outputs after finalise input loop
@@ -244,18 +293,480 @@ class Run:
 
         return store
 
+    def run_slice(self, store, i_name, targets, emin, emax, prefix=""):
+        """Event loop on the emin, emax slice of the current input."""
+
+        if self.batch_size and self.is_batch_plan(store, targets):
+            self.run_batches(store, i_name, targets, emin, emax, prefix)
+            return
+
+        info = f"{self.state} ({i_name},  emin: {emin},  emax: {emax})".rjust(70, ".")
+
+        self._in.set_idx(emin)
+
+        erange = emax - emin + 1
+
+        prefetcher = None
+
+        # input constants stay on the transient store for the whole slice.
+        store.pin("INPUT:name", i_name)
+        store.pin("INPUT:config", self.inputs[i_name])
+
+        for idx in tqdm(
+            range(erange),
+            desc=f"{prefix}{info}",
+            disable=self.no_progress_bar,
+            bar_format=self.colors[self.state]["event"],
+        ):
+            store.put("EVENT:idx", self._in.get_idx())
+
+            if prefetcher:
+                self.put_prefetched(store, prefetcher)
+
+            elif self.prefetch and idx == 0:
+                # learn which event variables are read.
+                self._learned = set()
+
+            self.loop(store, targets)
+
+            if self._learned is not None:
+
+                if idx < erange - 1:
+                    prefetcher = self.start_prefetcher(i_name, self._in.get_idx() + 1, emax)
+
+                self._learned = None
+
+            store.advance()
+
+            self._in.set_next_event()
+
+            if self.checkpoint:
+                self.update_checkpoint(store, i_name, emin + idx + 1)
+
+        store.clear("TRAN")
+
+        if prefetcher:
+            prefetcher.stop()
+
+    def start_prefetcher(self, i_name, emin, emax):
+        """Starts reading ahead the event variables read during the first event."""
+
+        if not self._learned:
+            return None
+
+        prefetcher = Prefetcher(
+            i_name,
+            self,
+            self.inputs[i_name],
+            sorted(self._learned),
+            depth=self.prefetch.get("depth", 64),
+            mode=self.prefetch.get("mode", "thread"),
+        )
+
+        prefetcher.start(emin, emax)
+
+        return prefetcher
+
+    def put_prefetched(self, store, prefetcher):
+        """Puts the variables of the current event read by the prefetcher on the store."""
+
+        e_idx, values = prefetcher.get()
+
+        if e_idx != self._in.get_idx():
+            sys.exit(
+                f"ERROR: prefetched event {e_idx} does not match current event {self._in.get_idx()}"
+            )
+
+        for name, value in values.items():
+            store.put(name, value, "TRAN")
+
+    def run_batches(self, store, i_name, targets, emin, emax, prefix=""):
+        """Event loop on the emin, emax slice of the current input running
+        the algorithms on batches of batch_size events."""
+
+        info = f"{self.state} ({i_name},  emin: {emin},  emax: {emax})".rjust(70, ".")
+
+        self._in.set_idx(emin)
+
+        store.pin("INPUT:name", i_name)
+        store.pin("INPUT:config", self.inputs[i_name])
+
+        for b_emin in tqdm(
+            range(emin, emax + 1, self.batch_size),
+            desc=f"{prefix}{info}",
+            disable=self.no_progress_bar,
+            bar_format=self.colors[self.state]["event"],
+        ):
+            n = min(self.batch_size, emax - b_emin + 1)
+
+            self.loop_batch(store, i_name, targets, n)
+
+            store.advance()
+
+            if self.checkpoint:
+                self.update_checkpoint(store, i_name, b_emin + n, n)
+
+        store.clear("TRAN")
+
+    def run_workers(self, store, i_name, targets, eslices, prefix=""):
+        """Distributes the event slices of the current input to a pool of worker
+        processes. A single slice is split in as many parts as workers."""
+
+        if len(eslices) == 1:
+            eslices = self.split_events_slice(*eslices[0], self.workers)
+
+        tasks = [(i_name, targets, [s]) for s in eslices]
+
+        info = f"{self.state} ({i_name},  workers: {self.workers})".rjust(70, ".")
+
+        self.fork_workers(store, tasks, f"{prefix}{info}")
+
+    def run_inputs(self, store, inputs_vs_targets, prefix=""):
+        """Runs the execute loop of different inputs at the same time on worker
+        processes. The largest inputs are scheduled first."""
+
+        tasks = [
+            (i_name, targets, None)
+            for i_name, targets in inputs_vs_targets.items()
+            if targets
+        ]
+
+        if not tasks:
+            return
+
+        order = sorted(
+            range(len(tasks)),
+            key=lambda t_idx: self.get_input_size(tasks[t_idx][0]),
+            reverse=True,
+        )
+
+        info = f"{self.state} (inputs,  workers: {self.workers})".rjust(70, ".")
+
+        self.fork_workers(store, tasks, f"{prefix}{info}", order=order)
+
+        for i_name, i_instance in self.instanciated_inputs.items():
+            if i_instance.is_loaded:
+                i_instance.offload()
+
+    def fork_workers(self, store, tasks, desc, order=None):
+        """Runs tasks on forked worker processes. Each worker inherits a copy of the
+        store as it is after the initialise step and opens its own input. Tasks are
+        submitted following order, if given. The PERM objects returned by the workers
+        are merged in the order of the tasks, so that the result does not depend on
+        which worker finishes first.
+        """
+
+        if order is None:
+            order = range(len(tasks))
+
+        _FORKED.update({"run": self, "store": store})
+
+        context = multiprocessing.get_context("fork")
+
+        with context.Pool(min(self.workers, len(tasks))) as pool:
+
+            results = {
+                t_idx: pool.apply_async(_execute_worker, (tasks[t_idx],))
+                for t_idx in order
+            }
+
+            for t_idx in tqdm(
+                range(len(tasks)),
+                desc=desc,
+                disable=self.no_progress_bar,
+                bar_format=self.colors[self.state]["event"],
+            ):
+                self.merge_store(store, results[t_idx].get())
+
+        _FORKED.clear()
+
+    def can_fork(self, store):
+        """Checks if the execute loop can run on worker processes. Trees on the PERM
+        store, e.g. those of TreeMaker, are written to the files of the parent process
+        and cannot be filled by the workers."""
+        trees = [n for n, o in store.check("any", "PERM").items() if FN.has_tree(o)]
+
+        if trees:
+            self.logger.warning(
+                f"trees in {', '.join(trees)} cannot be filled by worker processes, "
+                "events are processed by the main process."
+            )
+
+        return not trees
+
+    def execute_worker(self, store, i_name, targets, eslices):
+        """Execute loop of a worker process. The mergeable PERM objects made by the
+        algorithms in the initialise state are emptied before the loop so that the
+        parent process only adds what has been filled here. Objects read from the
+        inputs are left as they are. Returns the objects to be merged by the parent
+        process."""
+
+        self.no_progress_bar = True
+
+        # checkpoints are only written by the main process.
+        self.checkpoint = {}
+
+        if self._timer:
+            self._timer.clear()
+
+        perm = store.get_created()
+
+        merge_names = [n for n, o in perm.items() if FN.is_mergeable(o)]
+
+        for n in merge_names:
+            FN.reset_object(perm[n])
+
+        self._in = Input(i_name, store, self.logger, self.inputs[i_name])
+        self._in.load()
+        self._in.set_event_names(self.get_event_names(store, targets))
+
+        if eslices is None:
+            eslices = self.get_events_slices(self._in.get_n_events())
+
+        for emin, emax in eslices:
+            self.run_slice(store, i_name, targets, emin, emax)
+
+        self._in.offload()
+
+        result = {
+            "PERM": {n: perm[n] for n in merge_names},
+            "READY": dict(store.check("any", "READY")),
+            "WRITTEN": dict(store.check("any", "WRITTEN")),
+        }
+
+        if self._timer:
+            result["TIMING"] = self._timer.get_records()
+
+        return result
+
+    def merge_store(self, store, result):
+        """Merges the objects returned by a worker process into the store."""
+
+        for name, obj in result["PERM"].items():
+            FN.merge_objects(store.get(name, "PERM"), obj)
+
+        for opt in ["READY", "WRITTEN"]:
+            for name, obj in result[opt].items():
+                if not store.check(name, opt):
+                    store.put(name, obj, opt)
+
+        if "TIMING" in result:
+            self._timer.merge(result["TIMING"])
+
     def loop(self, store, targets):
-        """Loop over required targets to resolve them. Skips completed ones."""
+        """Replays the execution plan of the targets on the current event."""
+        self.replay(store, self.get_plan(store, targets), self.call_state)
+
+    def loop_batch(self, store, i_name, targets, n):
+        """Replays the execution plan of the targets on the next n events.
+        Event variables are put on the store as columns before running the
+        algorithms on the whole batch. Columns are read from the readers in one
+        go if they support it, otherwise one event at a time. Values read one
+        at a time are copied, as readers can reuse their buffers for the next
+        event."""
+        plan = self.get_plan(store, targets)
+
+        names = [
+            name
+            for t_name, steps in plan
+            for name, alg, config, is_target in steps
+            if not alg and name.startswith("EVENT:")
+        ]
+
+        idx = self._in.get_idx()
+
+        columns, values = {}, {}
+
+        for name in names:
+            column = self.read_column(name, n)
+
+            if column is None:
+                values[name] = []
+            else:
+                columns[name] = column
+
+        if values:
+            for e_idx in range(n):
+
+                for name, v in values.items():
+                    self.read(name)
+                    v.append(FN.copy_value(store.get(name, "TRAN")))
+
+                store.advance()
+
+                self._in.set_next_event()
+
+            for name, v in values.items():
+                columns[name] = FN.make_column(v)
+
+        else:
+            self._in.set_idx(idx + n)
+
+        store.put("EVENT:idx", np.arange(idx, idx + n), "TRAN")
+
+        for name, column in columns.items():
+            store.put(name, column, "TRAN")
+
+        # the input is now past the batch: undeclared variables cannot be read.
+        self._batch_names = columns
+
+        self.replay(
+            store,
+            plan,
+            lambda alg, config: self.call_batch(alg, config, n),
+        )
+
+        self._batch_names = None
+
+    def replay(self, store, plan, call):
+        """Replays an execution plan. Skips completed objects. Objects which are
+        not declared as input of an algorithm are still resolved on demand by the
+        store. Algorithms are run with call(alg, config)."""
+        for t_name, steps in plan:
+
+            self._history[t_name] = []
+            self._target_history = self._history[t_name]
+
+            self._history["CURRENT TARGET"] = t_name
+
+            for name, alg, config, is_target in steps:
+
+                if not alg:
+                    if not store.exists(name):
+                        self.read(name)
+
+                elif is_target or not store.exists(name):
+
+                    config["name"] = name
+
+                    if self._timer:
+                        self._timer.start()
+
+                    call(alg, config)
+
+                    if self._timer:
+                        self._timer.stop(self.get_timer_key("algorithm", name, alg.name))
+
+    def call_state(self, alg, config):
+        """Runs an algorithm on the current event for the current state."""
+
+        # preparing input variables
+        getattr(alg, "_" + self.state)(config)
+
+        # executing main algorithm state
+        getattr(alg, self.state)(config)
+
+    def call_batch(self, alg, config, n):
+        """Runs an algorithm on a batch of n events."""
+        alg._execute_batch(config, n)
+
+        alg.execute_batch(config, n)
+
+    def get_event_names(self, store, targets):
+        """Returns the EVENT: variables declared as input in the plan of the targets."""
+        return {
+            name
+            for t_name, steps in self.get_plan(store, targets)
+            for name, alg, config, is_target in steps
+            if not alg and name.startswith("EVENT:")
+        }
+
+    def is_batch_plan(self, store, targets):
+        """Checks if all the algorithms in the plan of the targets implement execute_batch."""
+        return all(
+            type(alg).execute_batch is not Algorithm.execute_batch
+            for t_name, steps in self.get_plan(store, targets)
+            for name, alg, config, is_target in steps
+            if alg
+        )
+
+    def get_plan(self, store, targets):
+        """Returns the execution plan of the targets for the current state.
+        Plans are compiled once and reused for every input and event."""
+        key = (self.state, tuple(t["name"] for t in targets))
+
+        if not key in self._plans:
+            self._plans[key] = self.build_plan(store, targets)
+
+        return self._plans[key]
+
+    def build_plan(self, store, targets):
+        """Compiles the static dependencies of the targets into a list of
+        (target, steps). Steps are (name, algorithm, config, is_target) tuples
+        ordered such that each object follows its dependencies. Reader variables
+        declared as input have no algorithm. Objects already planned for a
+        previous target are not repeated. Names are interned by the store so that
+        their slots exist before the loop.
+        """
+        plan, planned = [], set()
+
         for t in targets:
 
-            self._history[t["name"]] = []
-            self._target_history = self._history[t["name"]]
+            steps = []
+
+            self.plan_dependencies(store, t["object"], steps, planned, [])
+
+            store.intern(t["name"])
 
-            self._history["CURRENT TARGET"] = t["name"]
+            steps.append(
+                (
+                    t["name"],
+                    self.get_algorithm(t["object"], store),
+                    self._config[t["object"]],
+                    True,
+                )
+            )
+
+            plan.append((t["name"], steps))
+
+        return plan
+
+    def plan_dependencies(self, store, obj_name, steps, planned, chain):
+        """Appends to steps the objects required by obj_name in the current state,
+        depth first. Circular dependencies are caught here."""
+
+        if obj_name in chain:
+            sys.exit(
+                f"ERROR: circular dependency {' -> '.join(chain + [obj_name])} for the {self.state} state"
+            )
 
-            self._config[t["object"]]["name"] = t["name"]
+        config = self._config[obj_name]
+
+        if self.state in config and "input" in config[self.state]:
+
+            prefixes = ("INPUT:", "EVENT:") if self.state == "execute" else ("INPUT:",)
+
+            for o in ST.get_items(config[self.state]["input"]):
+
+                if o in self._config or o in planned:
+                    continue
+
+                if o.startswith(prefixes):
+                    planned.add(o)
+                    store.intern(o)
+                    steps.append((o, None, None, False))
+
+        if "dependency" in config:
+
+            for o in sorted(config["dependency"][self.state]):
+
+                if o in planned:
+                    continue
+
+                self.plan_dependencies(store, o, steps, planned, chain + [obj_name])
+
+                planned.add(o)
+                store.intern(o)
+                steps.append((o, self.get_algorithm(o, store), self._config[o], False))
+
+    def get_algorithm(self, obj_name, store):
+        """Returns the algorithm instance computing an object."""
+        alg_name = self._config[obj_name]["algorithm"]["name"]
+
+        if not alg_name in self.algorithms:
+            self.add(alg_name, store)
 
-            self.call(t["object"], is_target=t["name"])
+        return self.algorithms[alg_name]
 
     def call(self, obj_name, is_target=""):
         """Calls an algorithm."""
@@ -279,12 +790,20 @@ class Run:
 
             self._target_history.append(entry)
 
+            if self._timer:
+                self._timer.start()
+
             # preparing input variables
             getattr(alg, "_" + self.state)(self._config[obj_name])
 
             # executing main algorithm state
             getattr(alg, self.state)(self._config[obj_name])
 
+            if self._timer:
+                self._timer.stop(
+                    self.get_timer_key("algorithm", self._config[obj_name]["name"], alg.name)
+                )
+
             # guaranteeing output variables
             """
             if self.state in {"initialise", "finalise"}:
@@ -300,14 +819,8 @@ class Run:
     def add(self, alg_name, store):
         """Adds instances of algorithms dynamically."""
         if not alg_name in self.algorithms:
-            self.algorithms.update(
-                {
-                    alg_name: getattr(importlib.import_module(m), m.split(".")[-1])(
-                        alg_name, store, self.logger
-                    )
-                    for m in sys.modules
-                    if alg_name == m.split(".")[-1]
-                }
+            self.algorithms[alg_name] = self.registry.get_algorithm(alg_name)(
+                alg_name, store, self.logger
             )
 
     def update_inputs_vs_targets(self, state, store, inputs_vs_targets):
@@ -326,10 +839,50 @@ class Run:
                 new_inputs_vs_targets[i_name].append(dict(t))
         return new_inputs_vs_targets
 
+    def read_column(self, name, n):
+        """Reads the column of an event variable for the next n events of the
+        current input. Returns None if its reader cannot read columns."""
+        if not self._timer:
+            return self._in.get_column(name, n)
+
+        self._timer.start()
+
+        column = self._in.get_column(name, n)
+
+        self._timer.stop(self.get_timer_key("reader", name, self._in.get_reader_name(name)))
+
+        return column
+
+    def read(self, name):
+        """Reads an object from the current input."""
+        if self._batch_names is not None and name.startswith("EVENT:"):
+            if not name in self._batch_names:
+                sys.exit(
+                    f"ERROR: {name} is not declared as input of the execute state, "
+                    "it cannot be read in batches."
+                )
+
+        if self._learned is not None and name.startswith("EVENT:"):
+            self._learned.add(name)
+
+        if not self._timer:
+            self._in.read(name)
+            return
+
+        self._timer.start()
+
+        self._in.read(name)
+
+        self._timer.stop(self.get_timer_key("reader", name, self._in.get_reader_name(name)))
+
+    def get_timer_key(self, obj_type, obj_name, obj_class):
+        """Builds the key identifying a timer record."""
+        return (self._in.name, self.state, obj_type, obj_name, obj_class)
+
     def update_store(self, obj_name, store):
         """Updates value of object on the store."""
         if not obj_name in self._config:
-            self._in.read(obj_name)
+            self.read(obj_name)
             return
 
         else:
@@ -344,6 +897,119 @@ class Run:
             self.call(obj_name)
             return
 
+    def load_checkpoint(self):
+        """Prepares checkpointing and, if resuming, reads the last checkpoint."""
+
+        self._checkpoint_file = os.path.join(
+            self.checkpoint.get("path", ""), f"{self.name}.checkpoint"
+        )
+
+        self._checkpoint_events = 0
+        self._checkpoint_time = timeit.default_timer()
+
+        if self.resume:
+
+            if not os.path.exists(self._checkpoint_file):
+                self.logger.warning(
+                    f"no checkpoint {self._checkpoint_file} found. Starting from scratch."
+                )
+                return
+
+            with open(self._checkpoint_file, "rb") as f:
+                self._resume = pickle.load(f)
+
+            self._inputs_done = list(self._resume["inputs_done"])
+
+    def update_checkpoint(self, store, i_name, idx, n_events=1):
+        """Writes a checkpoint if the number of events or the time since the
+        previous one exceed the configured values."""
+
+        self._checkpoint_events += n_events
+
+        if (
+            "events" in self.checkpoint
+            and self._checkpoint_events >= self.checkpoint["events"]
+        ) or (
+            "seconds" in self.checkpoint
+            and timeit.default_timer() - self._checkpoint_time
+            >= self.checkpoint["seconds"]
+        ):
+            self.write_checkpoint(store, i_name, idx)
+
+    def write_checkpoint(self, store, i_name, idx):
+        """Saves the PERM store and the position of the event loop, i.e. the input
+        and the index of the next event to process. Objects written incrementally
+        to the output files, like trees, are saved to their files instead."""
+
+        perm = {}
+
+        for name, obj in store.check("any", "PERM").items():
+
+            if name == "history" or name.startswith("OUTPUT:"):
+                continue
+
+            if FN.autosave(obj):
+                continue
+
+            try:
+                perm[name] = pickle.dumps(obj)
+
+            except Exception:
+                self.logger.warning(f"object {name} cannot be saved in the checkpoint.")
+
+        checkpoint = {
+            "input": i_name,
+            "idx": idx,
+            "inputs_done": list(self._inputs_done),
+            "PERM": perm,
+            "READY": dict(store.check("any", "READY")),
+            "WRITTEN": dict(store.check("any", "WRITTEN")),
+        }
+
+        with open(f"{self._checkpoint_file}.tmp", "wb") as f:
+            pickle.dump(checkpoint, f)
+
+        os.replace(f"{self._checkpoint_file}.tmp", self._checkpoint_file)
+
+        self._checkpoint_events = 0
+        self._checkpoint_time = timeit.default_timer()
+
+    def restore_checkpoint(self, store):
+        """Replaces the objects built by the initialise step with those saved
+        in the checkpoint."""
+
+        for name, obj in self._resume["PERM"].items():
+            store.put(name, pickle.loads(obj), "PERM", replace=True)
+
+        for opt in ["READY", "WRITTEN"]:
+            for name, obj in self._resume[opt].items():
+                if not store.check(name, opt):
+                    store.put(name, obj, opt)
+
+    def resume_events_slices(self, i_name, eslices):
+        """Removes the events processed before the checkpoint from the slices."""
+
+        if i_name in self._resume["inputs_done"]:
+            return []
+
+        if i_name != self._resume["input"]:
+            return eslices
+
+        idx = self._resume["idx"]
+
+        return [(max(emin, idx), emax) for emin, emax in eslices if emax >= idx]
+
+    def get_input_size(self, i_name):
+        """Returns the size in bytes of the files of an input."""
+        if not "files" in self.inputs[i_name]:
+            return 0
+
+        return sum(
+            os.path.getsize(f)
+            for f in FN.flatten(self.inputs[i_name]["files"])
+            if os.path.isfile(f)
+        )
+
     def get_history(self, show=False):
         """Returns the algorithm history."""
         if show:
@@ -430,6 +1096,23 @@ class Run:
 
         return eslices
 
+    def split_events_slice(self, emin, emax, nparts):
+        """Splits an events slice in nparts contiguous slices."""
+
+        part = int((emax - emin + 1) / nparts)
+
+        if not part:
+            return [(emin, emax)]
+
+        eslices = [
+            (emin + s_idx * part, emin + (s_idx + 1) * part - 1)
+            for s_idx in range(nparts)
+        ]
+
+        eslices[-1] = (eslices[-1][0], emax)
+
+        return eslices
+
     def check_events_slices(self, emin, emax, tot):
         """Validate events slice."""
 
@@ -6,12 +6,74 @@ import traceback
 
 from pyrate.utils import functions as FN
 
+_OPTS = ["TRAN", "PERM", "READY", "WRITTEN"]
+
+# location tags are bit masks of the stores holding an object.
+_BITS = {"TRAN": 1, "PERM": 2, "READY": 4, "WRITTEN": 8}
+
+# generation of the pinned transient objects, valid in any generation.
+_PINNED = sys.maxsize
+
+# store returned by a lookup without option for each location tag.
+_FIRST = [None] + [next(o for o in _OPTS if m & _BITS[o]) for m in range(1, 16)]
+
+# sentinel of the empty slots.
+_EMPTY = object()
+
+_PLACEHOLDER = "PYRATE:none"
+
 
 class Store:
+    __slots__ = [
+        "_run",
+        "name",
+        "_handles",
+        "_names",
+        "_slots",
+        "_tran",
+        "_where",
+        "_none",
+        "_gen",
+        "_tran_gen",
+        "_pinned",
+        "_default",
+        "_opt",
+        "_created",
+        "_written",
+        "_inputs",
+    ]
+
     def __init__(self, run):
         self._run = run
         self.name = self._run.name
-        self._objects = {"PERM": {}, "TRAN": {}, "READY": {}, "WRITTEN": {}}
+
+        # ----------------------------------------------------------------------------------------
+        # Object names are interned into integer handles indexing the slots. Each store keeps
+        # its objects in a list of slots, empty slots holding a sentinel. The location tag of
+        # a handle records which of the PERM, READY and WRITTEN stores hold the object, and a
+        # second tag which stores hold a placeholder. A TRAN slot is valid only if it has been
+        # written during the current generation, i.e. the current event, or if it is pinned.
+        # ----------------------------------------------------------------------------------------
+        self._handles = {}
+        self._names = []
+        self._slots = {opt: [] for opt in _OPTS}
+        self._tran = self._slots["TRAN"]
+        self._where = []
+        self._none = []
+
+        self._gen = 0
+        self._tran_gen = []
+        self._pinned = []
+
+        # PERM objects put by the algorithms in the initialise state.
+        self._created = set()
+
+        # TRAN slots written in the current generation, released when advancing.
+        self._written = []
+
+        # handles of the INPUT: objects.
+        self._inputs = set()
+
         self._default = {
             None: "TRAN",
             "initialise": "PERM",
@@ -19,6 +81,8 @@ class Store:
             "finalise": "PERM",
         }
 
+        self.set_state(self._run.state)
+
         # ----------------------------------------------------------------------------------------
         # PERM:
         #     objects which are persistent throughout the run.
@@ -30,50 +94,137 @@ class Store:
         #     map holding the boolean status of objects which have already been written to output.
         # ----------------------------------------------------------------------------------------
 
+    def set_state(self, state):
+        """Sets the store used by default by put in the given state of the run."""
+        self._opt = self._default[state]
+
+    def intern(self, name):
+        """Returns the handle of an object name, adding a slot for it if needed."""
+        h = self._handles.get(name)
+
+        if h is None:
+            h = self._handles[name] = len(self._names)
+
+            self._names.append(name)
+
+            for slots in self._slots.values():
+                slots.append(_EMPTY)
+
+            self._where.append(0)
+            self._none.append(0)
+            self._tran_gen.append(-1)
+
+        return h
+
     def put(self, name, obj, opt=None, replace=False):
         """Objects should be put on the store only once!"""
-          
+
         if not opt:
-            opt = self._default[self._run.state]
+            opt = self._opt
 
-        if self.check(name, opt) and not replace:
-            self._run.logger.warning(
-                f"object {name} is already on the {opt} store."
-            )
-            return
+        h = self._handles.get(name)
 
-        self._objects[opt][name] = obj
+        if h is None:
+            h = self.intern(name)
 
+        bit = _BITS[opt]
 
-    def get(self, name, opt=None):
-        """try/except among objects."""
+        if opt == "TRAN":
+            if self._tran_gen[h] >= self._gen and not replace and not self._none[h] & bit:
+                self._run.logger.warning(f"object {name} is already on the {opt} store.")
+                return
 
-        opts1, opts2 = [], []
+            self._tran[h] = obj
+            self._tran_gen[h] = self._gen
+
+            self._written.append(h)
+
+            if name.startswith("INPUT:"):
+                self._inputs.add(h)
 
-        if opt:
-            opts1, opts2 = [opt], [opt]
         else:
-            opts1 = ["TRAN", "PERM", "READY", "WRITTEN"]
-            opts2 = ["TRAN", "PERM", "READY", "WRITTEN"]
+            if self._where[h] & bit and not replace and not self._none[h] & bit:
+                self._run.logger.warning(f"object {name} is already on the {opt} store.")
+                return
+
+            self._slots[opt][h] = obj
+            self._where[h] |= bit
+
+            if opt == "PERM" and self._run.state == "initialise":
+                if not self._is_input(obj):
+                    self._created.add(h)
+
+        if obj.__class__ is str and obj == _PLACEHOLDER:
+            self._none[h] |= bit
+        else:
+            self._none[h] &= ~bit
+
+    def _is_input(self, obj):
+        """Checks if obj is an INPUT: object on the transient store, i.e. it has
+        been read from an input rather than made by an algorithm."""
+        return any(
+            self._tran[h] is obj for h in self._inputs if self._tran_gen[h] >= self._gen
+        )
+
+    def get_created(self):
+        """Returns a dictionary of the PERM objects put by the algorithms in the
+        initialise state, e.g. the histograms filled in the event loop."""
+        return {
+            self._names[h]: self._slots["PERM"][h]
+            for h in sorted(self._created)
+            if self._where[h] & _BITS["PERM"]
+        }
+
+    def pin(self, name, obj):
+        """Puts an object on the transient store which stays valid across events,
+        e.g. constants of the input, until the transient store is cleared."""
+        self.put(name, obj, "TRAN", replace=True)
+
+        h = self._handles[name]
+
+        self._tran_gen[h] = _PINNED
+        self._pinned.append(h)
 
-        # first try to retrieve the object from the store.
-        while opts1:
-            try:
-                return self._objects[opts1.pop(0)][name]
+    def _lookup(self, name, opt):
+        """Returns the object or the empty sentinel."""
+        h = self._handles.get(name)
 
-            except KeyError:
-                pass
+        if h is None:
+            return _EMPTY
+
+        if self._tran_gen[h] >= self._gen:
+            if not opt or opt == "TRAN":
+                return self._tran[h]
+
+        elif opt == "TRAN":
+            return _EMPTY
+
+        if opt:
+            return self._slots[opt][h]
+
+        where = self._where[h]
+
+        if where:
+            return self._slots[_FIRST[where]][h]
+
+        return _EMPTY
+
+    def get(self, name, opt=None):
+        """Returns the object, looking for it in the transient store first."""
+
+        obj = self._lookup(name, opt)
+
+        if obj is not _EMPTY:
+            return obj
 
         # the object is not there so we'll update the store.
         self._run.update_store(name, self)
 
         # try to retrieve the object a second time.
-        while opts2:
-            try:
-                return self._objects[opts2.pop(0)][name]
+        obj = self._lookup(name, opt)
 
-            except KeyError:
-                pass
+        if obj is not _EMPTY:
+            return obj
 
         # if none of the previous instructions has returned the object
         # we will output an error message and exit.
@@ -101,39 +252,105 @@ class Store:
         return copy(self.get(name, opt))
 
     def check(self, name, opt=None):
-        """Checks if object is in the store."""
+        """Checks if object is in the store. Placeholders are not considered. With
+        name = any it returns a dictionary of the objects in the opt store."""
         if name != "any":
 
-            if opt:
+            h = self._handles.get(name)
 
-                try:
-                    return not (self._objects[opt][name] == "PYRATE:none")
+            if h is None:
+                return False
 
-                except KeyError:
-                    return False
+            is_tran = self._tran_gen[h] >= self._gen
 
-            else:
+            if opt == "TRAN" or (not opt and is_tran):
+                return is_tran and not self._none[h] & _BITS["TRAN"]
 
-                for opt in ["TRAN", "PERM", "READY", "WRITTEN"]:
-                    
-                    if name in self._objects[opt]:
-                        return not (self._objects[opt][name] == "PYRATE:none")
+            where = self._where[h]
 
+            if opt:
+                bit = _BITS[opt]
+
+            elif where:
+                bit = _BITS[_FIRST[where]]
+
+            else:
                 return False
 
+            return bool(where & bit) and not self._none[h] & bit
+
         else:
             assert (
                 opt
             ), "ERROR: specify option for the store if the check function uses name = any!"
-            return self._objects[opt]
+
+            slots = self._slots[opt]
+
+            if opt == "TRAN":
+                return {
+                    self._names[h]: slots[h]
+                    for h, gen in enumerate(self._tran_gen)
+                    if gen >= self._gen
+                }
+
+            bit = _BITS[opt]
+
+            return {
+                self._names[h]: slots[h]
+                for h, where in enumerate(self._where)
+                if where & bit
+            }
+
+    def exists(self, name):
+        """Checks if an object, placeholders included, is on any of the stores."""
+        h = self._handles.get(name)
+
+        return h is not None and (
+            self._tran_gen[h] >= self._gen or self._where[h] != 0
+        )
+
+    def advance(self):
+        """Moves to the next event. Transient objects, except the pinned ones, are
+        invalidated by starting a new generation. The slots written in the previous
+        one are emptied, so that their objects can be released."""
+        self._gen += 1
+
+        self._release()
+
+    def _release(self):
+        """Empties the transient slots written so far, except the pinned ones."""
+        for h in self._written:
+            if self._tran_gen[h] != _PINNED:
+                self._tran[h] = _EMPTY
+
+        self._written.clear()
 
     def clear(self, opt):
-        """Clears the store or portions of it."""
-        if opt != "all":
-            self._objects[opt].clear()
-        else:
-            for opt in self._objects:
-                self._objects[opt].clear()
+        """Clears the store or portions of it. Handles are kept."""
+        opts = _OPTS if opt == "all" else [opt]
+
+        for opt in opts:
+
+            if opt == "TRAN":
+                # unpin the input constants and release them.
+                for h in self._pinned:
+                    self._tran_gen[h] = -1
+                    self._tran[h] = _EMPTY
+
+                self._pinned.clear()
+
+                self._gen += 1
+
+                self._release()
+                continue
+
+            bit, slots = _BITS[opt], self._slots[opt]
+
+            for h, where in enumerate(self._where):
+                if where & bit:
+                    slots[h] = _EMPTY
+                    self._where[h] = where & ~bit
+                    self._none[h] &= ~bit
 
 
 # EOF
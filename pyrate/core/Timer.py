@@ -0,0 +1,94 @@
+""" Timer class. It records the wall time spent by algorithms and readers.
+Records are identified by a key, here a tuple (input, state, type, object, class),
+and hold the number of calls, the inclusive time and the self time, i.e. the
+inclusive time minus the time spent in nested records.
+"""
+import csv
+import json
+import timeit
+
+_FIELDS = ["input", "state", "type", "object", "class", "calls", "inclusive", "self"]
+
+
+class Timer:
+    __slots__ = ["name", "logger", "_records", "_stack"]
+
+    def __init__(self, name, logger):
+        self.name = name
+        self.logger = logger
+        self._records = {}
+        self._stack = []
+
+    def start(self):
+        """Starts timing a new record nested in the current one, if any."""
+        self._stack.append([timeit.default_timer(), 0.0])
+
+    def stop(self, key):
+        """Stops timing the current record and adds it to the key entry."""
+        start, children = self._stack.pop()
+
+        inclusive = timeit.default_timer() - start
+
+        if self._stack:
+            self._stack[-1][1] += inclusive
+
+        self._add(key, 1, inclusive, inclusive - children)
+
+    def _add(self, key, calls, inclusive, exclusive):
+        """Increments the record of key."""
+        if not key in self._records:
+            self._records[key] = [0, 0.0, 0.0]
+
+        record = self._records[key]
+
+        record[0] += calls
+        record[1] += inclusive
+        record[2] += exclusive
+
+    def get_records(self):
+        """Returns the records."""
+        return self._records
+
+    def merge(self, records):
+        """Merges records collected by another timer, e.g. by a worker process."""
+        for key, record in records.items():
+            self._add(key, *record)
+
+    def clear(self):
+        """Removes all records."""
+        self._records.clear()
+        self._stack.clear()
+
+    def get_table(self):
+        """Returns the records as a list of dictionaries sorted by self time."""
+        table = [
+            dict(zip(_FIELDS, list(key) + record))
+            for key, record in self._records.items()
+        ]
+
+        return sorted(table, key=lambda r: r["self"], reverse=True)
+
+    def write(self, f_name):
+        """Writes the records to f_name.json and f_name.csv files."""
+        table = self.get_table()
+
+        with open(f"{f_name}.json", "w") as f:
+            json.dump(table, f, indent=2)
+
+        with open(f"{f_name}.csv", "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=_FIELDS)
+            writer.writeheader()
+            writer.writerows(table)
+
+    def log(self, n_lines=20):
+        """Logs the records with the largest self time."""
+        self.logger.info(f"Timing report for {self.name} (seconds)")
+
+        for r in self.get_table()[:n_lines]:
+            self.logger.info(
+                f"{r['self']:12.4f} self {r['inclusive']:12.4f} incl {r['calls']:10d} calls  "
+                f"{r['input']}:{r['state']}:{r['type']}  {r['object']} ({r['class']})"
+            )
+
+
+# EOF
@@ -1,6 +1 @@
-"""pyrate core. importing algorithms is necessary for the Run to be able to find them."""
-
-import pyrate.algorithms
-
-# import pyrate.readers
-# import pyrate.writers
+"""pyrate core. Algorithms are imported on demand through the algorithm registry."""
@@ -4,8 +4,12 @@ https://docs.python.org/3.0/library/mmap.html.
 
 Binary data is written according to this scheme:
     https://darkmatteraustralia.atlassian.net/wiki/spaces/SABRE/pages/32276849/DAQ+-+Data+acquisition+for+experimental+data
-It is read using this method: 
+The header is read using this method: 
     https://docs.python.org/3.8/library/struct.html
+Events are exposed as a NumPy structured array over the memory map, so that event
+variables are returned as views without copies, e.g. waveforms as int16 arrays.
+Columns of events are available with get_column, e.g.
+get_column("EVENT:board_1:raw_waveform_ch_3", 0, 100) returns a (100, record_length) array.
 
 EVENT or INPUT (header) variables should be accessed using the namespace reported in the following dictionaries:
     Example: EVENT:board_2:raw_waveform_ch_3, EVENT:timestamp, INPUT:n_boards, INPUT:board_1:name, etc...
@@ -46,8 +50,10 @@ board_(b_idx):
 
 """
 import os
+import sys
 import mmap
 import struct
+import numpy as np
 
 from pyrate.core.Reader import Reader
 
@@ -60,13 +66,14 @@ class ReaderBlueTongueMMAP(Reader):
     __slots__ = [
         "f",
         "structure",
-        "_event",
         "_mmf",
         "_hd",
         "_ev",
         "_file_size",
         "_header_size",
         "_event_size",
+        "_events",
+        "_fields",
     ]
 
     def __init__(self, name, store, logger, f_name, structure):
@@ -83,7 +90,6 @@ class ReaderBlueTongueMMAP(Reader):
         self._idx = 0
 
         self._mmf = mmap.mmap(self.f.fileno(), length=0, access=mmap.ACCESS_READ)
-        self._event = 0
 
         self._event_size = 0
         self._header_size = 0
@@ -91,30 +97,44 @@ class ReaderBlueTongueMMAP(Reader):
         self._set_header_dict()
         self._set_event_dict()
 
+        self.set_n_events()
+
+        self._events = np.frombuffer(
+            self._mmf,
+            dtype=self._get_event_dtype(),
+            count=self._n_events,
+            offset=self._header_size,
+        )
+        self._fields = {}
+
         self.f.close()
 
     def offload(self):
         self.is_loaded = False
-        self._mmf.close()
+        self._events = None
 
-    def read(self, name):
+        try:
+            self._mmf.close()
 
-        if name.startswith("EVENT:"):
+        except BufferError:
+            # views of the events are still referenced outside the transient store,
+            # e.g. waveforms kept by an algorithm. Dropping the map here leaves it
+            # to be closed when the last of them is garbage collected.
+            self.logger.warning(
+                f"{self.name}: event views still referenced, {self.f.name} stays mapped until they are released."
+            )
 
-            if self._event != self._idx * self._event_size + self._header_size:
-                self._event = self._idx * self._event_size + self._header_size
+        self._mmf = None
 
-                self._move(self._event)
+    def read(self, name):
 
-            variable = self._break_path(name)
+        if name.startswith("EVENT:"):
 
-            self._read_variable(name, variable)
+            self._read_variable(name)
 
         elif name.startswith("INPUT:"):
 
-            variable = self._break_path(name)
-
-            self._read_header(name, variable)
+            self.read_header(name)
 
     def _get_items(self, i_number, i_type, merge=False):
         """Get a number of items from the file of type i_type.
@@ -235,6 +255,58 @@ class ReaderBlueTongueMMAP(Reader):
 
         self._ev["check_word"] = (1, "H", self._add_to_size(_T["H"]))
 
+    def _get_event_dtype(self):
+        """Builds the structured dtype of an event from the event dictionary.
+        Fields are named after the variable paths, e.g. board_1:raw_waveform_ch_3."""
+
+        names, formats, offsets = [], [], []
+
+        for k, v in self._ev.items():
+            items = v.items() if isinstance(v, dict) else [(None, v)]
+
+            for var, (items_number, items_type, items_offset) in items:
+                names.append(f"{k}:{var}" if var else k)
+                offsets.append(items_offset)
+
+                if "raw_waveform" in names[-1]:
+                    formats.append((items_type, (items_number,)))
+                else:
+                    formats.append(items_type)
+
+        return np.dtype(
+            {
+                "names": names,
+                "formats": formats,
+                "offsets": offsets,
+                "itemsize": self._event_size,
+            }
+        )
+
+    def _get_field(self, name):
+        """Returns the field of the event dtype for a variable name. If the
+        board is not given the first variable with that name is used."""
+        if not name in self._fields:
+            path = name.split(":", 1)[-1]
+
+            fields = [
+                f
+                for f in self._events.dtype.names
+                if f == path or f.split(":")[-1] == path
+            ]
+
+            if not fields:
+                sys.exit(f"ERROR: variable {name} not found in {self.name}.")
+
+            self._fields[name] = fields[0]
+
+        return self._fields[name]
+
+    def get_column(self, name, start, stop):
+        """Returns the values of an event variable for the events from start to stop
+        excluded, e.g. an (n_events, record_length) array for waveforms. The values
+        are copied from the file, so that they do not hold the memory map."""
+        return np.array(self._events[self._get_field(name)][start:stop])
+
     def set_n_events(self):
         """Reads number of events using the last event header."""
         if not self._n_events:
@@ -242,43 +314,25 @@ class ReaderBlueTongueMMAP(Reader):
                 (self._file_size - self._header_size) / self._event_size
             )
 
-    def _read_header(self, name, variable):
-        """Reads variable from the header dictionary and puts it in the transient store."""
-
-        value = FN.grab(variable, self._hd)
-
-        self.store.put(name, value, "TRAN")
-
-    def _read_variable(self, name, variable):
-        """Reads variable from the event and puts it in the transient store."""
-        pos_current_line = self._mmf.tell()
-
-        t = FN.grab(variable, self._ev)
-
-        items_number, items_type, items_offset = t[0], t[1], t[2]
+    def _get_header(self, name):
+        """Reads variable from the header dictionary and returns it."""
 
-        self._mmf.seek(items_offset, 1)
+        return FN.grab(self._break_path(name), self._hd)
 
-        value = self._get_items(items_number, items_type)
+    def _read_variable(self, name):
+        """Reads variable from the event and puts it in the transient store.
+        Waveforms are views of the file, other variables are integers."""
+        value = self._events[self._idx][self._get_field(name)]
 
-        if "raw_waveform" in name:
-            value = list(value)
-        else:
-            value = value[0]
+        if not "raw_waveform" in name:
+            value = int(value)
 
         self.store.put(name, value, "TRAN")
 
-        self._mmf.seek(pos_current_line)
-
     def _break_path(self, name):
         """Return the variable name."""
 
         return name.split(":")[-1]
 
-    def _move(self, byte):
-        """Move file position to byte number."""
-
-        self._mmf.seek(byte)
-
 
 # EOF
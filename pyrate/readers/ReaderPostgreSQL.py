@@ -1,13 +1,104 @@
-""" Reader of a PostgreSQL database. 
+""" Reader of a PostgreSQL database.
+Event variables are named EVENT:QUERY:table:row:column. The row is either a
+number or idx, for the row of the current event. Rows of a table are read with
+a server-side cursor over the columns needed, fetching fetch_size rows at a time
+as the event index advances. Fixed rows are read once with a single query and
+then served from memory. Rows are ordered by the column given for the table in
+order_by, if any. Columns of consecutive rows are read in bulk with get_columns,
+which uses COPY ... TO STDOUT (FORMAT binary), e.g. for the batches of events.
+
+Connections are taken from a pool of the process, shared by all the inputs
+with the same connection parameters. Single read-only statements, e.g. INPUT:
+queries, are prepared once while a reader holds a connection and then executed
+by name. The results of INPUT: queries can be cached, in memory and optionally
+on disk, see QueryCache.
+
+    database:
+        connection: ...
+        tables:
+          - muonmonitoring
+        order_by:
+          muonmonitoring: time
+        fetch_size: 1000
+        pool_size: 8
+        cache:
+          ttl: 3600 (seconds)
+          size: 1000 (results)
+          path: /path/to/cache/folder (optional)
 """
+import io
+import os
 import sys
 import psycopg2
+import psycopg2.pool
+import numpy as np
 
 from pyrate.core.Reader import Reader
+from pyrate.core.QueryCache import QueryCache
+
+FETCH_SIZE = 1000
+
+# types of columns which can be copied in binary format to NumPy arrays, by OID.
+_DTYPES = {
+    16: ">?",  # bool
+    20: ">i8",  # int8
+    21: ">i2",  # int2
+    23: ">i4",  # int4
+    700: ">f4",  # float4
+    701: ">f8",  # float8
+}
+
+_COPY_SIGNATURE = b"PGCOPY\n\xff\r\n\x00"
+
+POOL_SIZE = 8
+
+# statements which are prepared, and whose results can be cached.
+_READ_ONLY = {"SELECT", "WITH", "VALUES"}
+
+# connection pools by process and connection parameters.
+_POOLS = {}
+
+# prepared statements by server process of the connection and query.
+_PREPARED = {}
+
+# query result caches by connection name and cache configuration.
+_CACHES = {}
+
+
+def get_connection(dsn, size=POOL_SIZE):
+    """Returns a connection from the pool of the process for dsn. Processes
+    forked by the run get their own pools."""
+    key = (os.getpid(), dsn)
+
+    if not key in _POOLS:
+        _POOLS[key] = psycopg2.pool.ThreadedConnectionPool(1, size, dsn)
+
+    return _POOLS[key].getconn()
+
+
+def put_connection(dsn, connection):
+    """Returns a connection to the pool of the process. Statements prepared on it
+    are deallocated, so that the next reader of the connection starts afresh."""
+    if not connection.closed and _PREPARED.pop(connection.get_backend_pid(), None):
+        with connection.cursor() as cursor:
+            cursor.execute("DEALLOCATE ALL")
+
+    _POOLS[(os.getpid(), dsn)].putconn(connection)
 
 
 class ReaderPostgreSQL(Reader):
-    __slots__ = ["db", "_db_connection", "_db_cursor", "_dbidx", "_tables"]
+    __slots__ = [
+        "db",
+        "_db_connection",
+        "_db_cursor",
+        "_dbidx",
+        "_tables",
+        "_cursors",
+        "_columns",
+        "_rows",
+        "_dsn",
+        "_cache",
+    ]
 
     def __init__(self, name, store, logger, db):
         super().__init__(name, store, logger)
@@ -15,9 +106,12 @@ class ReaderPostgreSQL(Reader):
 
     def load(self):
         self.is_loaded = True
+
+        self._dsn = " ".join([f"{k}='{v}'" for k, v in self.db["connection"].items()])
+
         try:
-            self._db_connection = psycopg2.connect(
-                " ".join([f"{k}='{v}'" for k, v in self.db["connection"].items()])
+            self._db_connection = get_connection(
+                self._dsn, self.db.get("pool_size", POOL_SIZE)
             )
 
         except (Exception, psycopg2.Error) as error:
@@ -31,10 +125,27 @@ class ReaderPostgreSQL(Reader):
         self._dbidx = None
         self._idx = 0
 
+        self._cursors = {}
+        self._columns = {}
+        self._rows = {}
+
+        self._cache = None
+
+        if "cache" in self.db:
+            self._set_cache(self.db["cache"])
+
     def offload(self):
         self.is_loaded = False
+
+        for c in self._cursors.values():
+            c["cursor"].close()
+
+        self._cursors = {}
+
         self._db_cursor.close()
-        self._db_connection.close()
+
+        # the connection stays open in the pool.
+        put_connection(self._dsn, self._db_connection)
 
     def read(self, name):
 
@@ -50,30 +161,256 @@ class ReaderPostgreSQL(Reader):
 
             self._read_data(name, query)
 
+    def set_event_names(self, names):
+        """Groups the columns to read by table, so that they are fetched together.
+        Columns only read from fixed rows do not need a cursor."""
+        for name in names:
+            if "QUERY:" in name:
+                table, event, variable = self._break_path(name)
+
+                if event == "idx" and not variable in self._columns.setdefault(
+                    table, []
+                ):
+                    self._columns[table].append(variable)
+
     def _read_data(self, name, query):
-        """Executes query on the database."""
+        """Executes query on the database. Results of read-only queries are
+        taken from the cache, if any."""
 
-        self._db_cursor.execute(query)
+        if self._cache is None or not query.split()[0].upper() in _READ_ONLY:
+            self._execute(query)
+
+            value = self._db_cursor.fetchall()
+
+        else:
+            key = QueryCache.get_key(self._cache.name, query)
 
-        value = self._db_cursor.fetchall()
+            found, value = self._cache.get(key)
+
+            if not found:
+                self._execute(query)
+
+                value = self._db_cursor.fetchall()
+
+                self._cache.put(key, value)
 
         self.store.put(name, value, "TRAN")
 
+    def _set_cache(self, config):
+        """Gets the result cache of the connection. Caches are shared by all the
+        readers of the process with the same connection and configuration."""
+        c = self.db["connection"]
+
+        # the password is not part of the name of the connection.
+        c_name = f"{c.get('user')}@{c.get('host')}:{c.get('port')}/{c['dbname']}"
+
+        key = (c_name, config.get("ttl"), config.get("size", 1000), config.get("path"))
+
+        if not key in _CACHES:
+            _CACHES[key] = QueryCache(c_name, self.logger, *key[1:])
+
+        self._cache = _CACHES[key]
+
     def _read_variable(self, name, table, row, variable):
         """Reads variable from specific row, considered to be an event."""
 
-        self._db_cursor.execute(f"SELECT {variable} FROM {table} OFFSET {row} LIMIT 1")
+        if row != "idx":
+            self.store.put(name, self._read_row(table, int(row), variable), "TRAN")
+            return
+
+        row = self._idx
+
+        c = self._cursors.get(table)
+
+        if c is None or not variable in c["columns"]:
+            # a column not requested yet needs a new cursor.
+            if not variable in self._columns.setdefault(table, []):
+                self._columns[table].append(variable)
+
+            c = self._open_cursor(table)
 
-        value = self._db_cursor.fetchall()[0][0]
+        if not c["start"] <= row < c["start"] + len(c["rows"]):
+            c = self._fetch(c, row)
+
+        value = c["rows"][row - c["start"]][c["columns"].index(variable)]
 
         self.store.put(name, value, "TRAN")
 
+    def _read_row(self, table, row, variable):
+        """Returns the value of a variable in a fixed row. Rows are read with the
+        columns requested so far and kept in memory, so that they are not read
+        again for each event nor move the cursor of the table."""
+        r = self._rows.setdefault((table, row), {})
+
+        if not variable in r:
+            columns = list(r) + [variable]
+
+            self._execute(f"{self._get_query(table, columns)} OFFSET {row} LIMIT 1")
+
+            values = self._db_cursor.fetchone()
+
+            if values is None:
+                sys.exit(f"ERROR: row {row} not found in {self.name}.")
+
+            r.update(zip(columns, values))
+
+        return r[variable]
+
+    def _open_cursor(self, table):
+        """Opens a server-side cursor over the columns of a table needed so far.
+        The query is planned once when the cursor is declared, a cursor cannot be
+        declared on a prepared statement."""
+        if table in self._cursors:
+            self._cursors[table]["cursor"].close()
+
+        cursor = self._db_connection.cursor(name=f"pyrate_{table}")
+        cursor.execute(self._get_query(table, self._columns[table]))
+
+        self._cursors[table] = {
+            "table": table,
+            "cursor": cursor,
+            "columns": list(self._columns[table]),
+            "start": 0,
+            "rows": [],
+        }
+
+        return self._cursors[table]
+
+    def _fetch(self, c, row):
+        """Fetches the batch of rows starting at row and returns the cursor.
+        Moving back to a row already passed requires opening the cursor again."""
+        position = c["start"] + len(c["rows"])
+
+        if row < position:
+            c = self._open_cursor(c["table"])
+            position = 0
+
+        if row > position:
+            c["cursor"].scroll(row - position, mode="relative")
+
+        c["start"] = row
+        c["rows"] = c["cursor"].fetchmany(self.db.get("fetch_size", FETCH_SIZE))
+
+        if not c["rows"]:
+            sys.exit(f"ERROR: row {row} not found in {self.name}.")
+
+        return c
+
+    def _get_query(self, table, columns):
+        """Returns the query of the columns of a table, in the order of the table."""
+        query = f"SELECT {', '.join(columns)} FROM {table}"
+
+        if table in self.db.get("order_by", {}):
+            query += f" ORDER BY {self.db['order_by'][table]}"
+
+        return query
+
+    def get_columns(self, table, columns, start=0, stop=None):
+        """Reads columns of a table into NumPy arrays, returned in a dictionary, for
+        the rows from start to stop excluded, or all of them. Numeric and boolean
+        columns are copied in binary format, other columns and columns with NULL
+        values are fetched as rows."""
+        query = self._get_query(table, columns)
+
+        # only the types of the columns are needed here.
+        self._execute(query + " LIMIT 0")
+
+        if start:
+            query += f" OFFSET {start}"
+
+        if stop is not None:
+            query += f" LIMIT {stop - start}"
+
+        oids = [d[1] for d in self._db_cursor.description]
+
+        if all(o in _DTYPES for o in oids):
+            buffer = io.BytesIO()
+
+            self._db_cursor.copy_expert(
+                f"COPY ({query}) TO STDOUT (FORMAT binary)", buffer
+            )
+
+            arrays = self._parse_copy(buffer.getvalue(), columns, oids)
+
+            if arrays is not None:
+                return arrays
+
+        # ranges of rows change with each batch, so the query is not prepared.
+        self._db_cursor.execute(query)
+
+        rows = self._db_cursor.fetchall()
+
+        return {c: np.array([r[c_idx] for r in rows]) for c_idx, c in enumerate(columns)}
+
+    def get_column(self, name, start, stop):
+        """Returns the values of an event variable for the rows from start to stop
+        excluded. Variables of fixed rows are not read as columns."""
+        table, event, variable = self._break_path(name)
+
+        if event != "idx":
+            return None
+
+        return self.get_columns(table, [variable], start, stop)[variable]
+
+    @staticmethod
+    def _parse_copy(data, columns, oids):
+        """Parses the output of a binary COPY of fixed size columns. Returns None
+        if some values are NULL, as rows then do not have a fixed size."""
+        if not data.startswith(_COPY_SIGNATURE):
+            sys.exit("ERROR: unexpected format of the binary COPY output.")
+
+        # signature, flags, header extension length and header extension.
+        start = len(_COPY_SIGNATURE) + 8
+        start += int(np.frombuffer(data, ">i4", count=1, offset=start - 4)[0])
+
+        fields = [("n_fields", ">i2")]
+
+        for c, o in zip(columns, oids):
+            fields += [(f"{c}_length", ">i4"), (c, _DTYPES[o])]
+
+        dtype = np.dtype(fields)
+
+        # the data ends with a trailer of two bytes.
+        n_rows = (len(data) - start - 2) // dtype.itemsize
+
+        if start + n_rows * dtype.itemsize + 2 != len(data):
+            return None
+
+        rows = np.frombuffer(data, dtype, count=n_rows, offset=start)
+
+        for c, o in zip(columns, oids):
+            if np.any(rows[f"{c}_length"] != np.dtype(_DTYPES[o]).itemsize):
+                return None
+
+        return {c: rows[c].astype(rows[c].dtype.newbyteorder("=")) for c in columns}
+
     def set_n_events(self):
         """Reads number of events which in this case are the table rows."""
         if not self._n_events:
-            self._db_cursor.execute(f"SELECT COUNT(*) FROM {self._tables[0]};")
+            self._execute(f"SELECT COUNT(*) FROM {self._tables[0]}")
             self._n_events = int(self._db_cursor.fetchall()[0][0])
 
+    def _execute(self, query):
+        """Executes a query with the cursor of the reader. Single read-only
+        statements are prepared the first time and then executed by name.
+        Prepared statements belong to the server process of the connection,
+        a connection which was reset gets a new one."""
+        prepared = _PREPARED.setdefault(self._db_connection.get_backend_pid(), {})
+
+        query = query.strip().rstrip(";")
+
+        if not query in prepared:
+
+            if ";" in query or not query.split()[0].upper() in _READ_ONLY:
+                self._db_cursor.execute(query)
+                return
+
+            prepared[query] = f"pyrate_{len(prepared)}"
+
+            self._db_cursor.execute(f"PREPARE {prepared[query]} AS {query}")
+
+        self._db_cursor.execute(f"EXECUTE {prepared[query]}")
+
     def _break_path(self, name):
         """Return variable name and eventual channel."""
 
@@ -1,39 +1,110 @@
 """ Reader of a ROOT file.
+If the EVENT: variables read by the job are declared with set_event_names,
+only their branches are enabled and a TTreeCache is filled with them. The size
+of the cache can be set in the input structure, e.g. cache_size: 30000000 (bytes).
+Branches with a single leaf of a basic type are bound to NumPy buffers with
+SetBranchAddress. Arrays are put on the store as copies of the buffers.
+Lookups of INPUT: histograms are cached, including missing ones, in a dictionary
+which can be shared by the readers of an input.
 """
 import os
+import sys
 from copy import copy
 
+import numpy as np
 import ROOT as R
 
 from pyrate.core.Reader import Reader
 
+from pyrate.utils import functions as FN
+
+CACHE_SIZE = 30000000
+
+_DTYPES = {
+    "Bool_t": np.bool_,
+    "Char_t": np.int8,
+    "UChar_t": np.uint8,
+    "Short_t": np.int16,
+    "UShort_t": np.uint16,
+    "Int_t": np.int32,
+    "UInt_t": np.uint32,
+    "Float_t": np.float32,
+    "Double_t": np.float64,
+    "Long64_t": np.int64,
+    "ULong64_t": np.uint64,
+}
+
 
 class ReaderROOT(Reader):
-    __slots__ = ["f", "structure", "_trees"]
+    __slots__ = ["f", "structure", "_trees", "_branches", "_cache"]
 
-    def __init__(self, name, store, logger, f_name, structure):
+    def __init__(self, name, store, logger, f_name, structure, cache=None):
         super().__init__(name, store, logger)
         self.f = f_name
         self.structure = structure
+        self._cache = {} if cache is None else cache
 
     def load(self):
         self.is_loaded = True
         self.f = R.TFile.Open(self.f)
         self._idx = 0
         self._trees = {}
+        self._branches = None
 
     def offload(self):
         self.is_loaded = False
 
-        # for tpath in self._trees:
-        #    self._trees[tpath]["tree"].GetTree().PrintCacheStats()
-
-        # print(
-        #    f"Bytes read: {self.f.GetBytesRead()},  Read calls: {self.f.GetReadCalls()}"
-        # )
+        if self._branches is not None:
+            self._report_reads(self.f.GetBytesRead(), self.f.GetReadCalls())
 
         self.f.Close()
 
+    def _report_reads(self, n_bytes, n_calls):
+        """Logs the branches read per tree and the bytes and read calls of the file.
+        The compressed bytes and baskets of the disabled branches of the whole trees
+        are logged as those saved, each basket being a read call if all branches
+        were read with GetEntry."""
+        for tree_path, t in self._trees.items():
+            tree = t["tree"]
+
+            branches = [tree.GetBranch(v) for v in t["branches"]]
+            branches = [b for b in branches if b]
+
+            zip_bytes = tree.GetZipBytes() - sum(b.GetZipBytes("*") for b in branches)
+
+            baskets = sum(self._get_baskets(b) for b in tree.GetListOfBranches())
+            baskets -= sum(self._get_baskets(b) for b in branches)
+
+            self.logger.info(
+                f"{self.name}: {len(t['branches'])} of "
+                f"{tree.GetListOfBranches().GetEntries()} branches of {tree_path} read, "
+                f"bytes saved {zip_bytes} (compressed), baskets saved {baskets}"
+            )
+
+        self.logger.info(f"{self.name}: bytes read {n_bytes}, read calls {n_calls}")
+
+    @staticmethod
+    def _get_baskets(branch):
+        """Returns the number of baskets of a branch and its sub-branches."""
+        return branch.GetWriteBasket() + sum(
+            ReaderROOT._get_baskets(b) for b in branch.GetListOfBranches()
+        )
+
+    def set_event_names(self, names):
+        """Groups the branches to read by tree. Trees already in use are updated."""
+        self._branches = {}
+
+        for name in names:
+            k, n = (3, 2) if "GROUP:" in name else (1, 2)
+
+            path, (tree, variable) = FN.break_path(name, k, n)
+
+            self._branches.setdefault(path + tree, set()).add(variable)
+
+        for tree_path, t in self._trees.items():
+            for variable in self._branches.get(tree_path, ()):
+                self._add_branch(t, variable)
+
     def read(self, name):
 
         k, n = 1, 1
@@ -47,32 +118,32 @@ class ReaderROOT(Reader):
             path, (
                 tree,
                 variable,
-            ) = self._break_path(name, k, n)
+            ) = FN.break_path(name, k, n)
 
             tree_path = path + tree
 
             # ------------------------------------------
             # Update the status of the trees.
             # ------------------------------------------
-            try:
+            if not tree_path in self._trees:
+                self._set_tree(tree_path)
 
-                if self._trees[tree_path]["idx"] != self._idx:
-                    self._trees[tree_path]["idx"] = self._idx
+            t = self._trees[tree_path]
 
-                    self._trees[tree_path]["tree"].LoadTree(self._idx)
+            if t["idx"] != self._idx:
+                t["idx"] = self._idx
 
-            except KeyError:
-                self._trees[tree_path] = {
-                    "idx": self._idx,
-                    "tree": self.f.Get(tree_path),
-                }
+                # local entry of the tree, different from the index for chains.
+                t["entry"] = t["tree"].LoadTree(self._idx)
 
-                self._trees[tree_path]["tree"].LoadTree(self._idx)
+                if self._branches is not None:
+                    # one call fills the buffers of all the enabled branches.
+                    t["tree"].GetEntry(self._idx)
 
-            self._read_variable(name, self._trees[tree_path]["tree"], variable)
+            self._read_variable(name, t, variable)
 
         elif name.startswith("INPUT:"):
-            path, (histogram,) = self._break_path(name, k, n)
+            path, (histogram,) = FN.break_path(name, k, n)
 
             self._read_hist(name, path, histogram)
 
@@ -81,6 +152,40 @@ class ReaderROOT(Reader):
         if not self._n_events:
             self._n_events = self.f.Get(self.structure["tree"]).GetEntries()
 
+    def _set_tree(self, tree_path):
+        """Gets a tree from the file. If the variables to read are known, all the
+        other branches are disabled and the TTreeCache only holds these."""
+        tree = self._get_tree(tree_path)
+
+        self._trees[tree_path] = {
+            "idx": None,
+            "entry": None,
+            "tree": tree,
+            "branches": set(),
+            "buffers": {},
+        }
+
+        if self._branches is not None:
+            tree.SetBranchStatus("*", 0)
+            tree.SetCacheSize(self.structure.get("cache_size", CACHE_SIZE))
+
+            for variable in self._branches.get(tree_path, ()):
+                self._add_branch(self._trees[tree_path], variable)
+
+            tree.StopCacheLearningPhase()
+
+    def _get_tree(self, tree_path):
+        """Returns a tree of the file."""
+        return self.f.Get(tree_path)
+
+    def _add_branch(self, t, variable):
+        """Enables the branch of a variable and adds it to the TTreeCache."""
+        if not variable in t["branches"] and t["tree"].GetBranch(variable):
+            t["branches"].add(variable)
+
+            t["tree"].SetBranchStatus(variable, 1)
+            t["tree"].AddBranchToCache(variable, True)
+
     def _read_hist(self, name, path, histogram):
         """Grabs histograms from the input file and puts them on the permanent store."""
 
@@ -88,38 +193,110 @@ class ReaderROOT(Reader):
         # overwriting this value only occurs if an histogram is found under 'name'
         # for the first time.
 
-        h = copy(self.f.Get(os.path.join(path, histogram)))
+        h = self._get_hist(os.path.join(path, histogram))
 
         if h:
+            # cached histograms are copied before being added to.
 
             if not self.store.check(name, "TRAN"):
-                self.store.put(name, h, "TRAN")
+                self.store.put(name, copy(h), "TRAN")
 
             elif not self.store.get(name, "TRAN"):
-                self.store.put(name, h, "TRAN", replace=True)
+                self.store.put(name, copy(h), "TRAN", replace=True)
 
             else:
                 self.store.get(name, "TRAN").Add(h)
         else:
             self.store.put(name, None, "TRAN")
 
-    def _read_variable(self, name, tree, variable):
-        """Reads a variable from a tree and puts it on the transient store."""
+    def _get_hist(self, h_path):
+        """Returns a histogram of the file, or None if missing."""
+        return self._get_cached_hist(self.f.GetName(), self.f, h_path)
+
+    def _get_cached_hist(self, f_name, f, h_path):
+        """Looks up a histogram in an open file through the cache. The keys of
+        the file are listed once, so that missing histograms are not looked for."""
+        c = self._cache.setdefault(f_name, {"keys": None, "hists": {}})
+
+        if not h_path in c["hists"]:
+
+            if c["keys"] is None:
+                c["keys"] = set(self._list_keys(f))
+
+            h = None
+
+            if h_path in c["keys"]:
+                h = copy(f.Get(h_path))
+                h.SetDirectory(0)
+
+            c["hists"][h_path] = h
+
+        return c["hists"][h_path]
+
+    @staticmethod
+    def _list_keys(directory, prefix=""):
+        """Yields the paths of all the keys of a directory and its subdirectories."""
+        for key in directory.GetListOfKeys():
+            path = prefix + key.GetName()
+
+            yield path
+
+            if R.TClass.GetClass(key.GetClassName()).InheritsFrom("TDirectory"):
+                subdirectory = directory.Get(key.GetName())
 
-        tree.GetBranch(variable).GetEntry(self._idx)
+                yield from ReaderROOT._list_keys(subdirectory, path + "/")
 
-        self.store.put(name, getattr(tree, variable), "TRAN")
+    def _set_buffer(self, t, variable):
+        """Binds the branch of a variable to a NumPy buffer if it has a single leaf
+        of a basic type, including fixed size arrays. Other branches, e.g. leaf
+        lists, objects, vectors or variable size arrays, are read with getattr."""
+        tree = t["tree"]
 
-    def _break_path(self, name, k, n):
-        """Breaks a given path excluding the INPUT/EVENT/:/GROUP prefix
-        using the k index. NB: Always retrieve elements of tuple
-        as (1, 2, ..., n,)."""
+        branch = tree.GetBranch(variable)
 
-        name = name.replace("/", ":").replace("::", ":")
+        if not branch:
+            sys.exit(f"ERROR: branch {variable} not found in {self.name}.")
 
-        t = name.split(":")
+        if self._branches is not None:
+            # variables not declared are enabled when first read.
+            self._add_branch(t, variable)
+
+        buffer, is_scalar = None, False
+
+        # split branches of objects are TBranchElements.
+        if branch.GetNleaves() == 1 and branch.IsA() == R.TBranch.Class():
+            leaf = branch.GetListOfLeaves().At(0)
+
+            if leaf.GetTypeName() in _DTYPES and not leaf.GetLeafCount():
+                buffer = np.zeros(leaf.GetLen(), dtype=_DTYPES[leaf.GetTypeName()])
+                is_scalar = leaf.GetLen() == 1
+
+        if buffer is not None:
+            tree.SetBranchAddress(variable, buffer)
+
+        t["buffers"][variable] = (branch, buffer, is_scalar)
+
+    def _read_variable(self, name, t, variable):
+        """Reads a variable from a tree and puts it on the transient store.
+        Arrays are copied, as the buffers are filled again for the next entry."""
+        if not variable in t["buffers"]:
+            self._set_buffer(t, variable)
+
+            t["buffers"][variable][0].GetEntry(t["entry"])
+
+        elif self._branches is None:
+            t["buffers"][variable][0].GetEntry(t["entry"])
+
+        branch, buffer, is_scalar = t["buffers"][variable]
+
+        if buffer is None:
+            value = getattr(t["tree"], variable)
+        elif is_scalar:
+            value = buffer.item()
+        else:
+            value = buffer.copy()
 
-        return "".join([f + "/" for f in t[k : len(t) - n]]), tuple(t[-n:])
+        self.store.put(name, value, "TRAN")
 
 
 # EOF
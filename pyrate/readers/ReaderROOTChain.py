@@ -0,0 +1,142 @@
+""" Reader of a group of ROOT files as one TChain per tree.
+It is selected with chain: true in the configuration of an input. Events are
+addressed with a global entry index, files are only opened when their entries
+are read and the TTreeCache keeps its branches across files.
+
+The number of entries of the main tree of each local file is saved to an index
+file, see pyrate.utils.index, so that counting events does not open the files
+after the first time.
+"""
+import os
+from copy import copy
+
+import numpy as np
+import ROOT as R
+
+from pyrate.readers.ReaderROOT import ReaderROOT
+
+from pyrate.utils import index as IX
+
+
+class ReaderROOTChain(ReaderROOT):
+    __slots__ = ["_entries", "_read_stats"]
+
+    def load(self):
+        self.is_loaded = True
+        self._idx = 0
+        self._trees = {}
+        self._entries = {}
+
+        # all branches are disabled and only the ones read are enabled, so that
+        # each entry is read with one GetEntry of the chain. Reading branches one
+        # by one, as when no selection is set, would use branch handles which are
+        # only valid for the file the chain is currently in.
+        self._branches = {}
+
+        self._read_stats = (R.TFile.GetFileBytesRead(), R.TFile.GetFileReadCalls())
+
+    def offload(self):
+        self.is_loaded = False
+
+        self._report_reads(
+            R.TFile.GetFileBytesRead() - self._read_stats[0],
+            R.TFile.GetFileReadCalls() - self._read_stats[1],
+        )
+
+        # files are closed with their chains.
+        self._trees = {}
+
+    def _report_reads(self, n_bytes, n_calls):
+        """Logs the branches read per chain and the bytes and read calls of all the
+        files. The bytes and baskets saved are not logged, as the branches of a chain
+        are only those of the tree of its current file."""
+        for tree_path, t in self._trees.items():
+            self.logger.info(
+                f"{self.name}: {len(t['branches'])} branches of {tree_path} read"
+            )
+
+        self.logger.info(f"{self.name}: bytes read {n_bytes}, read calls {n_calls}")
+
+    def set_n_events(self):
+        """Adds the entries of the main tree of all the files."""
+        if not self._n_events:
+            self._n_events = sum(
+                self._get_entries(f_name, self.structure["tree"]) for f_name in self.f
+            )
+
+    def _get_tree(self, tree_path):
+        """Returns a chain of the tree of all the files. Files are added with their
+        number of entries, if known, so that they are not opened by the chain."""
+        tree = R.TChain(tree_path)
+
+        for f_name in self.f:
+
+            if tree_path == self.structure["tree"]:
+                tree.Add(f_name, self._get_entries(f_name, tree_path))
+
+            else:
+                tree.Add(f_name)
+
+        return tree
+
+    def _get_entries(self, f_name, tree_path):
+        """Returns the number of entries of a tree in a file. For local files it
+        is read from the index of the file."""
+        key = (f_name, tree_path)
+
+        if not key in self._entries:
+            # e.g. entries_SABRE_EventData
+            i_name = "entries_" + tree_path.replace("/", "_")
+
+            arrays = IX.load(f_name) if os.path.isfile(f_name) else None
+
+            if arrays is None or not i_name in arrays:
+                f = R.TFile.Open(f_name)
+                entries = f.Get(tree_path).GetEntries()
+                f.Close()
+
+                if os.path.isfile(f_name):
+                    arrays = dict(arrays or {})
+                    arrays[i_name] = np.array([entries], dtype=np.int64)
+
+                    IX.save(f_name, arrays)
+
+            else:
+                entries = arrays[i_name][0]
+
+            self._entries[key] = int(entries)
+
+        return self._entries[key]
+
+    def _get_hist(self, h_path):
+        """Returns the sum of a histogram over all the files. A file is only
+        opened if its keys have not been listed yet or if it has the histogram
+        and this is not in the cache. Histograms are copied to the cache and
+        the file is closed."""
+        h = None
+
+        for f_name in self.f:
+
+            c = self._cache.setdefault(f_name, {"keys": None, "hists": {}})
+
+            if h_path in c["hists"]:
+                f_h = c["hists"][h_path]
+
+            elif c["keys"] is not None and not h_path in c["keys"]:
+                f_h = None
+
+            else:
+                f = R.TFile.Open(f_name)
+                f_h = self._get_cached_hist(f_name, f, h_path)
+                f.Close()
+
+            if f_h and h is None:
+                h = copy(f_h)
+
+            elif f_h:
+                h.Add(f_h)
+
+        return h
+
+
+# EOF
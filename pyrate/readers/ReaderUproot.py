@@ -0,0 +1,182 @@
+""" Columnar reader of a ROOT file, using uproot: https://uproot.readthedocs.io.
+It is selected with backend: uproot in the configuration of an input and does
+not require ROOT. Branches are read for chunks of entries into NumPy arrays and
+events are served from these arrays. The number of entries of a chunk can be
+set in the input structure, e.g. chunk_size: 10000.
+
+Variables are named as for ReaderROOT, e.g. EVENT:path:tree:branch. This backend
+is meant for EVENT: variables: INPUT: histograms are put on the store as
+(counts, edges) NumPy arrays, which the plot algorithms cannot use as they
+expect ROOT histograms. Inputs whose histograms are plotted should use PyROOT.
+"""
+import os
+import sys
+
+import numpy as np
+import uproot
+
+from pyrate.core.Reader import Reader
+
+from pyrate.utils import functions as FN
+
+CHUNK_SIZE = 10000
+
+
+class ReaderUproot(Reader):
+    __slots__ = ["f", "structure", "_trees", "_branches"]
+
+    def __init__(self, name, store, logger, f_name, structure):
+        super().__init__(name, store, logger)
+        self.f = f_name
+        self.structure = structure
+
+    def load(self):
+        self.is_loaded = True
+        self.f = uproot.open(self.f)
+        self._idx = 0
+        self._trees = {}
+        self._branches = {}
+
+    def offload(self):
+        self.is_loaded = False
+        self.f.close()
+
+    def set_event_names(self, names):
+        """Groups the branches to read by tree. They are read together in each chunk."""
+        self._branches = {}
+
+        for name in names:
+            k, n = (3, 2) if "GROUP:" in name else (1, 2)
+
+            path, (tree, variable) = FN.break_path(name, k, n)
+
+            self._branches.setdefault(path + tree, set()).add(variable)
+
+    def read(self, name):
+
+        k, n = 1, 1
+
+        if "GROUP:" in name:
+            k += 2
+
+        if name.startswith("EVENT:"):
+            n += 1
+
+            path, (
+                tree,
+                variable,
+            ) = FN.break_path(name, k, n)
+
+            tree_path = path + tree
+
+            if not tree_path in self._trees:
+                self._set_tree(tree_path)
+
+            t = self._trees[tree_path]
+
+            if not t["start"] <= self._idx < t["stop"]:
+                self._read_chunk(t)
+
+            self._read_variable(name, t, variable)
+
+        elif name.startswith("INPUT:"):
+            path, (histogram,) = FN.break_path(name, k, n)
+
+            self._read_hist(name, path, histogram)
+
+    def set_n_events(self):
+        """Reads number of events in the main tree of the file."""
+        if not self._n_events:
+            self._n_events = self.f[self.structure["tree"]].num_entries
+
+    def get_column(self, name, start, stop):
+        """Returns the values of an event variable for the events from start to stop
+        excluded, read from the file in one go."""
+        k = 3 if "GROUP:" in name else 1
+
+        path, (tree, variable) = FN.break_path(name, k, 2)
+
+        return self.f[path + tree][variable].array(
+            entry_start=start, entry_stop=stop, library="np"
+        )
+
+    def _set_tree(self, tree_path):
+        """Gets a tree from the file. No chunk is read yet."""
+        try:
+            tree = self.f[tree_path]
+
+        except uproot.KeyInFileError:
+            sys.exit(f"ERROR: tree {tree_path} not found in {self.name}.")
+
+        self._trees[tree_path] = {
+            "path": tree_path,
+            "tree": tree,
+            "start": 0,
+            "stop": 0,
+            "arrays": {},
+        }
+
+    def _read_chunk(self, t):
+        """Reads the chunk of entries starting at the current event. Only the
+        declared branches are read, other branches are added when requested."""
+        t["start"] = self._idx
+        t["stop"] = min(
+            self._idx + self.structure.get("chunk_size", CHUNK_SIZE),
+            t["tree"].num_entries,
+        )
+
+        branches = self._branches.get(t["path"], ())
+
+        t["arrays"] = t["tree"].arrays(
+            [b for b in branches if b in t["tree"]],
+            entry_start=t["start"],
+            entry_stop=t["stop"],
+            library="np",
+        )
+
+    def _read_variable(self, name, t, variable):
+        """Puts the value of a variable for the current event on the transient store.
+        Arrays are views of the chunk, other values are Python scalars."""
+        if not variable in t["arrays"]:
+
+            if not variable in t["tree"]:
+                sys.exit(f"ERROR: branch {variable} not found in {self.name}.")
+
+            t["arrays"][variable] = t["tree"][variable].array(
+                entry_start=t["start"], entry_stop=t["stop"], library="np"
+            )
+
+        value = t["arrays"][variable][self._idx - t["start"]]
+
+        if isinstance(value, np.generic):
+            value = value.item()
+
+        self.store.put(name, value, "TRAN")
+
+    def _read_hist(self, name, path, histogram):
+        """Grabs histograms from the input file and puts them on the transient store.
+        Counts of the same histogram in different files are added."""
+
+        h_path = os.path.join(path, histogram)
+
+        try:
+            h = self.f[h_path].to_numpy()
+
+        except uproot.KeyInFileError:
+            h = None
+
+        if h:
+
+            if not self.store.check(name, "TRAN"):
+                self.store.put(name, h, "TRAN")
+
+            elif not self.store.get(name, "TRAN"):
+                self.store.put(name, h, "TRAN", replace=True)
+
+            else:
+                self.store.get(name, "TRAN")[0][...] += h[0]
+        else:
+            self.store.put(name, None, "TRAN")
+
+
+# EOF
@@ -3,14 +3,34 @@ This version of the reader uses memory mapping to read the file:
 https://docs.python.org/3.0/library/mmap.html.
 This makes the reading process less memory demanding but slightly slower.
 This reader should be used for larger files, e.g. >= 1 GB.
+The byte offsets of events and channels are found in one scan of the file
+and saved to an index file, see pyrate.utils.index. An event is decoded in
+full the first time one of its variables is read.
 """
+import re
 import mmap
 
+import numpy as np
+
 from pyrate.core.Reader import Reader
 
+from pyrate.utils import index as IX
+
+_MARKERS = re.compile(rb"=== EVENT (\d+) ===|=== (CH: (\d+)) ")
+
 
 class ReaderWaveCatcherMMAP(Reader):
-    __slots__ = ["f", "structure", "_event", "_mmf", "_mmidx"]
+    __slots__ = [
+        "f",
+        "structure",
+        "_event",
+        "_mmf",
+        "_mmidx",
+        "_index",
+        "_epos",
+        "_ch_cols",
+        "_record",
+    ]
 
     def __init__(self, name, store, logger, f_name, structure):
         super().__init__(name, store, logger)
@@ -25,9 +45,17 @@ class ReaderWaveCatcherMMAP(Reader):
         self._mmf = mmap.mmap(self.f.fileno(), length=0, access=mmap.ACCESS_READ)
         self._mmidx = None
         self._event = 0
+        self._epos = None
+        self._record = None
 
         self.f.close()
 
+        self._index = IX.get(
+            self.f.name, self._build_index, ("offsets", "numbers", "ch_numbers", "ch_offsets")
+        )
+
+        self._ch_cols = {c: col for col, c in enumerate(self._index["ch_numbers"])}
+
     def offload(self):
         self.is_loaded = False
         self._mmf.close()
@@ -39,10 +67,8 @@ class ReaderWaveCatcherMMAP(Reader):
             if self._mmidx != self._idx + 1:
                 self._mmidx = self._idx + 1
 
-                event = f"=== EVENT {self._mmidx} ==="
-
-                self._move(event)
-                self._event = self._mmf.tell()
+                self._move_event(self._mmidx)
+                self._record = None
 
             variable, channel = self._break_path(name)
 
@@ -50,10 +76,13 @@ class ReaderWaveCatcherMMAP(Reader):
 
         elif name.startswith("INPUT:"):
 
-            self._read_header(name)
+            self.read_header(name)
 
     def set_n_events(self):
         """Reads number of events using the last event header."""
+        if not self._n_events and len(self._index["numbers"]):
+            self._n_events = int(self._index["numbers"][-1])
+
         if not self._n_events:
             pos_current_line = self._mmf.tell()
 
@@ -63,8 +92,8 @@ class ReaderWaveCatcherMMAP(Reader):
 
             self._mmf.seek(pos_current_line)
 
-    def _read_header(self, name):
-        """Reads variable from run header and puts it in the transient store."""
+    def _get_header(self, name):
+        """Reads variable from run header and returns it."""
         pos_current_line = self._mmf.tell()
 
         variable = name.split(":")[1]
@@ -80,16 +109,81 @@ class ReaderWaveCatcherMMAP(Reader):
                 value = str(s).replace("[", "").replace("]", "")
                 break
 
-        self.store.put(name, value, "TRAN")
-
         self._mmf.seek(pos_current_line)
 
+        return value
+
     def _read_variable(self, name, channel, variable):
-        """Reads variable from the event  and puts it in the transient store."""
+        """Reads variable from the event and puts it in the transient store.
+        Variables are served from the decoded event, if they are found in it."""
+        if self._record is None:
+            self._record = self._decode_event()
+
+        if channel:
+            values = self._record["channels"].get(channel, {})
+        else:
+            values = self._record["event"]
+
+        if variable == "RawWaveform" and isinstance(values.get(variable), bytes):
+            # samples are only converted when requested.
+            values[variable] = [float(s) for s in values[variable].split(b" ")[:-1]]
+
+        if variable in values:
+            value = values[variable]
+        else:
+            value = self._find_variable(channel, variable)
+
+        self.store.put(name, value, "TRAN")
+
+    def _decode_event(self):
+        """Decodes the current event in one pass. Returns the variables of the
+        event header and, for each channel, its variables and raw waveform line."""
+        if self._epos is not None and self._epos + 1 < len(self._index["offsets"]):
+            end = int(self._index["offsets"][self._epos + 1])
+        else:
+            end = self._mmf.find(b"=== EVENT ", self._event + 1)
+
+        block = self._mmf[self._event : end if end > 0 else None]
+
+        lines = iter(block.split(b"\n")[1:])
+
+        event, channels = {}, {}
+
+        for line in lines:
+            tokens = line.decode("utf-8").split(" ")
+
+            if line.startswith(b"=== CH: "):
+                # e.g. === CH: 0 EVENTID: 1 FCR: 0 Baseline: 0.001 V ... ===
+                values = {}
+
+                for t_idx, t in enumerate(tokens[:-1]):
+                    if t.endswith(":") and not t[:-1] in values:
+                        try:
+                            values[t[:-1]] = float(tokens[t_idx + 1])
+                        except ValueError:
+                            pass
+
+                # the samples are on the line following the channel header.
+                values["RawWaveform"] = next(lines, b"")
+
+                channels[f"CH: {tokens[2]}"] = values
+
+            else:
+                # e.g. === UnixTime = 1.6 date = 2021.5.10 time = 9h.37m.38s.400ms ...
+                tokens = [t for t in tokens if t]
+
+                for t_idx, t in enumerate(tokens[:-2]):
+                    if tokens[t_idx + 1] == "=" and not "=" in tokens[t_idx + 2]:
+                        event.setdefault(t, tokens[t_idx + 2])
+
+        return {"event": event, "channels": channels}
+
+    def _find_variable(self, channel, variable):
+        """Searches variable in the event and returns it."""
         pos_current_line = self._mmf.tell()
 
         if channel:
-            self._move(channel)
+            self._move_channel(channel)
 
             if variable == "RawWaveform":
                 # will need to move one line forward.
@@ -122,10 +216,10 @@ class ReaderWaveCatcherMMAP(Reader):
                     value = str(s)
                     break
 
-        self.store.put(name, value, "TRAN")
-
         self._mmf.seek(pos_current_line)
 
+        return value
+
     def _break_path(self, name):
         """Return variable name and eventual channel."""
 
@@ -141,6 +235,59 @@ class ReaderWaveCatcherMMAP(Reader):
 
         return var, ch
 
+    def _build_index(self):
+        """Finds the offsets of all events and of their channels in one scan."""
+        offsets, numbers, channels = [], [], []
+
+        for m in _MARKERS.finditer(self._mmf):
+            if m.group(1) is not None:
+                offsets.append(m.start())
+                numbers.append(int(m.group(1)))
+                channels.append([])
+
+            elif channels:
+                channels[-1].append((int(m.group(3)), m.start(2)))
+
+        # channel offsets are only kept if all events record the same channels.
+        ch_numbers = [c for c, o in channels[0]] if channels else []
+
+        if not all([c for c, o in ch] == ch_numbers for ch in channels):
+            ch_numbers, channels = [], []
+
+        return {
+            "offsets": np.array(offsets, dtype=np.int64),
+            "numbers": np.array(numbers, dtype=np.int64),
+            "ch_numbers": np.array(ch_numbers, dtype=np.int64),
+            "ch_offsets": np.array(
+                [[o for c, o in ch] for ch in channels], dtype=np.int64
+            ).reshape(len(channels), len(ch_numbers)),
+        }
+
+    def _move_event(self, number):
+        """Moves to the beginning of the event with the given number."""
+        numbers = self._index["numbers"]
+
+        self._epos = number - numbers[0] if len(numbers) else -1
+
+        if 0 <= self._epos < len(numbers) and numbers[self._epos] == number:
+            self._event = int(self._index["offsets"][self._epos])
+            self._mmf.seek(self._event)
+
+        else:
+            self._epos = None
+            self._move(f"=== EVENT {number} ===")
+            self._event = self._mmf.tell()
+
+    def _move_channel(self, channel):
+        """Moves to the beginning of a channel of the current event."""
+        col = self._ch_cols.get(int(channel.split(" ")[-1]))
+
+        if self._epos is not None and col is not None:
+            self._mmf.seek(int(self._index["ch_offsets"][self._epos, col]))
+
+        else:
+            self._move(channel)
+
     def _move(self, s, opt="frw"):
         """Move file position to beginning of string s.
         The option of choosing to read the file backward is given.
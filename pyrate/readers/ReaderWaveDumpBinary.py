@@ -0,0 +1,133 @@
+""" Reader of a binary WaveDump file.
+This version of the reader maps the file to a NumPy structured array:
+https://numpy.org/doc/stable/reference/generated/numpy.memmap.html.
+
+Binary files are written by WaveDump with the option OUTPUT_FILE_FORMAT BINARY
+and OUTPUT_FILE_HEADER YES. Each event is a header of six 32-bit words followed
+by the samples, as 16-bit words:
+
+    Event Size (bytes, including the header)
+    Board ID
+    Pattern
+    Channel
+    Event Counter
+    Trigger Time Tag
+    samples ...
+
+Events have a fixed size, so the file is read with a stride given by the size of
+the first event. Variables have the names of the ASCII reader, without spaces:
+    Example: EVENT:RawWaveform, EVENT:TriggerTimeStamp, INPUT:RecordLength, etc...
+"""
+import os
+import sys
+import numpy as np
+
+from pyrate.core.Reader import Reader
+
+_HEADER = [
+    ("EventSize", "<u4"),
+    ("BoardID", "<u4"),
+    ("Pattern", "<u4"),
+    ("Channel", "<u4"),
+    ("EventNumber", "<u4"),
+    ("TriggerTimeStamp", "<u4"),
+]
+
+# names of the header words in the binary format documentation.
+_ALIASES = {"EventCounter": "EventNumber", "TriggerTimeTag": "TriggerTimeStamp"}
+
+
+class ReaderWaveDumpBinary(Reader):
+    __slots__ = ["f", "structure", "_events", "_len_waveform"]
+
+    def __init__(self, name, store, logger, f_name, structure):
+        super().__init__(name, store, logger)
+        self.f = f_name
+        self.structure = structure
+
+    def load(self):
+        self.is_loaded = True
+        self._idx = 0
+
+        event_size = int(np.fromfile(self.f, dtype="<u4", count=1)[0])
+
+        self._len_waveform = (event_size - np.dtype(_HEADER).itemsize) // 2
+
+        if self._len_waveform < 0:
+            sys.exit(f"ERROR: {self.f} is not a binary WaveDump file with headers.")
+
+        # a truncated last event is left out by the integer division.
+        self._events = np.memmap(
+            self.f,
+            dtype=_HEADER + [("RawWaveform", "<u2", (self._len_waveform,))],
+            mode="r",
+            shape=(os.path.getsize(self.f) // event_size,),
+        )
+
+    def offload(self):
+        self.is_loaded = False
+        self._events = None
+
+    def read(self, name):
+
+        if name.startswith("EVENT:"):
+
+            variable = self._break_path(name)
+
+            self._read_variable(name, variable)
+
+        elif name.startswith("INPUT:"):
+
+            self.read_header(name)
+
+    def set_n_events(self):
+        """Reads number of events from the file size."""
+        if not self._n_events:
+            self._n_events = len(self._events)
+
+    def get_column(self, name, start, stop):
+        """Returns the values of an event variable for the events from start to stop
+        excluded, e.g. an (n_events, record_length) array for waveforms. The values
+        are copied from the file, so that they do not hold the memory map."""
+        variable = self._break_path(name)
+
+        if variable == "RecordLength":
+            return np.full(stop - start, self._len_waveform)
+
+        return np.array(self._events[variable][start:stop])
+
+    def _get_header(self, name):
+        """Reads variable from the header of the first event and returns it."""
+        variable = self._break_path(name)
+
+        if variable == "RecordLength":
+            return self._len_waveform
+
+        return int(self._events[0][variable])
+
+    def _read_variable(self, name, variable):
+        """Reads variable from the event and puts it in the transient store.
+        The waveform is a view of the file, other variables are integers."""
+        if variable == "RecordLength":
+            value = self._len_waveform
+
+        elif variable == "RawWaveform":
+            value = self._events[self._idx]["RawWaveform"]
+
+        else:
+            value = int(self._events[self._idx][variable])
+
+        self.store.put(name, value, "TRAN")
+
+    def _break_path(self, name):
+        """Return the variable name."""
+        variable = name.split(":")[-1].replace(" ", "")
+        variable = _ALIASES.get(variable, variable)
+
+        if not variable in self._events.dtype.names and variable != "RecordLength":
+            sys.exit(f"ERROR: variable {name} not found in {self.name}.")
+
+        return variable
+
+
+# EOF
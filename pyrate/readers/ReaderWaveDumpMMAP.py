@@ -1,12 +1,19 @@
 """ Reader of a WaveDump file. 
 This version of the reader uses memory mapping to read the file:
 https://docs.python.org/3.0/library/mmap.html.
+The byte offsets of events are found in one scan of the file and saved
+to an index file, see pyrate.utils.index.
 """
+import re
 import mmap
-# import numpy as np
+import numpy as np
 
 from pyrate.core.Reader import Reader
 
+from pyrate.utils import index as IX
+
+_MARKERS = re.compile(rb"Event Number: (\d+)")
+
 
 class ReaderWaveDumpMMAP(Reader):
     __slots__ = [
@@ -17,6 +24,7 @@ class ReaderWaveDumpMMAP(Reader):
         "_mmidx",
         "_mmidx_offset",
         "_len_waveform",
+        "_index",
     ]
 
     def __init__(self, name, store, logger, f_name, structure):
@@ -38,6 +46,8 @@ class ReaderWaveDumpMMAP(Reader):
 
         self.f.close()
 
+        self._index = IX.get(self.f.name, self._build_index, ("offsets", "numbers"))
+
     def offload(self):
         self.is_loaded = False
         self._mmf.close()
@@ -49,10 +59,7 @@ class ReaderWaveDumpMMAP(Reader):
             if self._mmidx != self._idx + self._mmidx_offset:
                 self._mmidx = self._idx + self._mmidx_offset
 
-                event = f"Event Number: {self._mmidx}"
-
-                self._move(event)
-                self._event = self._mmf.tell()
+                self._move_event(self._mmidx)
 
             variable = self._break_path(name)
 
@@ -60,7 +67,7 @@ class ReaderWaveDumpMMAP(Reader):
 
         elif name.startswith("INPUT:"):
 
-            self._read_header(name)
+            self.read_header(name)
 
     def _set_len_waveform(self):
         """Set the length of recorded waveform parameter."""
@@ -75,6 +82,10 @@ class ReaderWaveDumpMMAP(Reader):
         """Reads number of events using the last event header.
         WaveDump files might have an offset from the first event.
         """
+        if not self._n_events and len(self._index["numbers"]):
+            self._mmidx_offset = int(self._index["numbers"][0])
+            self._n_events = int(self._index["numbers"][-1]) - self._mmidx_offset
+
         if not self._n_events:
             pos_current_line = self._mmf.tell()
 
@@ -90,8 +101,8 @@ class ReaderWaveDumpMMAP(Reader):
 
             self._mmf.seek(pos_current_line)
 
-    def _read_header(self, name):
-        """Reads variable from run header and puts it in the transient store."""
+    def _get_header(self, name):
+        """Reads variable from run header and returns it."""
         pos_current_line = self._mmf.tell()
 
         variable = name.split(":")[-1]
@@ -107,10 +118,10 @@ class ReaderWaveDumpMMAP(Reader):
             self._move(variable, "bkw")
             value = int(self._mmf.readline().decode("utf-8").split(" ")[-1])
 
-        self.store.put(name, value, "TRAN")
-
         self._mmf.seek(pos_current_line)
 
+        return value
+
     def _read_variable(self, name, variable):
         """Reads variable from the event and puts it in the transient store."""
         pos_current_line = self._mmf.tell()
@@ -149,6 +160,33 @@ class ReaderWaveDumpMMAP(Reader):
 
         return name.split(":")[-1]
 
+    def _build_index(self):
+        """Finds the offsets of all events in one scan."""
+        offsets, numbers = [], []
+
+        for m in _MARKERS.finditer(self._mmf):
+            offsets.append(m.start())
+            numbers.append(int(m.group(1)))
+
+        return {
+            "offsets": np.array(offsets, dtype=np.int64),
+            "numbers": np.array(numbers, dtype=np.int64),
+        }
+
+    def _move_event(self, number):
+        """Moves to the event header line with the given number."""
+        numbers = self._index["numbers"]
+
+        pos = number - numbers[0] if len(numbers) else -1
+
+        if 0 <= pos < len(numbers) and numbers[pos] == number:
+            self._event = int(self._index["offsets"][pos])
+            self._mmf.seek(self._event)
+
+        else:
+            self._move(f"Event Number: {number}")
+            self._event = self._mmf.tell()
+
     def _move(self, s, opt="frw"):
         """Move file position to beginning of string s.
         The option of choosing to read the file backward is given.
@@ -1,6 +1,19 @@
-from pyrate.readers.ReaderROOT import ReaderROOT
-from pyrate.readers.ReaderWaveCatcherMMAP import ReaderWaveCatcherMMAP
-from pyrate.readers.ReaderWaveCatcherLC import ReaderWaveCatcherLC
-from pyrate.readers.ReaderWaveDumpMMAP import ReaderWaveDumpMMAP
-from pyrate.readers.ReaderBlueTongueMMAP import ReaderBlueTongueMMAP
-from pyrate.readers.ReaderPostgreSQL import ReaderPostgreSQL
+"""pyrate readers. Readers are imported when first accessed, so that their
+dependencies, e.g. ROOT or psycopg2, are only required if used."""
+
+from pyrate.utils.functions import lazy_getattr
+
+__getattr__ = lazy_getattr(
+    __name__,
+    [
+        "ReaderROOT",
+        "ReaderROOTChain",
+        "ReaderUproot",
+        "ReaderWaveCatcherMMAP",
+        "ReaderWaveCatcherLC",
+        "ReaderWaveDumpMMAP",
+        "ReaderWaveDumpBinary",
+        "ReaderBlueTongueMMAP",
+        "ReaderPostgreSQL",
+    ],
+)
@@ -1,7 +1,11 @@
 """ Logic functions.
 """
 import os
-from copy import copy
+import sys
+import importlib
+from copy import copy, deepcopy
+
+import numpy as np
 
 
 def modus_ponens(p, q):
@@ -32,10 +36,12 @@ def find_files(paths, env=None):
             p = p.replace(env, os.environ.get(env))
 
         if not os.path.isfile(p):
+            # event index files written by the readers are not data files.
             files.extend(
                 os.path.join(p, f)
                 for f in os.listdir(p)
                 if os.path.isfile(os.path.join(p, f))
+                and not f.endswith(".pyrate.idx")
             )
         else:
             files.append(p)
@@ -168,6 +174,18 @@ def grab(key, dictionary):
     return [i for i in find(key, dictionary)][0]
 
 
+def break_path(name, k, n):
+    """Breaks a given path excluding the INPUT/EVENT/:/GROUP prefix
+    using the k index. NB: Always retrieve elements of tuple
+    as (1, 2, ..., n,). Used by the readers of ROOT files."""
+
+    name = name.replace("/", ":").replace("::", ":")
+
+    t = name.split(":")
+
+    return "".join([f + "/" for f in t[k : len(t) - n]]), tuple(t[-n:])
+
+
 def get_color(my_color):
     """Given a pixel string it prepares a pixel dictionary."""
     my_color = my_color.replace(" ", "")
@@ -195,4 +213,180 @@ def add_colors(my_color_list):
     return added_color
 
 
+def is_tree(obj):
+    """Checks if an object is a ROOT tree."""
+    return hasattr(obj, "InheritsFrom") and obj.InheritsFrom("TTree")
+
+
+def has_tree(obj):
+    """Checks if an object is or contains a ROOT tree."""
+    if isinstance(obj, dict):
+        return any(has_tree(v) for v in obj.values())
+
+    if isinstance(obj, (list, tuple)):
+        return any(has_tree(v) for v in obj)
+
+    return is_tree(obj)
+
+
+def is_mergeable(obj):
+    """Checks if an object accumulates event data and can be merged with a copy of itself.
+    Lists are records which are extended. Tuples and dictionaries have a fixed structure
+    and are merged item by item, so they are mergeable if any of their items is. Histograms
+    are recognised by their Add method. Trees are not mergeable, as they are written to
+    the file they are attached to."""
+    if isinstance(obj, dict):
+        return any(is_mergeable(v) for v in obj.values())
+
+    if isinstance(obj, tuple):
+        return any(is_mergeable(v) for v in obj)
+
+    return isinstance(obj, list) or (hasattr(obj, "Add") and not is_tree(obj))
+
+
+def reset_object(obj):
+    """Empties a mergeable object keeping its structure. Objects attached to a
+    file are moved to memory so that they can be filled and shipped elsewhere."""
+    if isinstance(obj, dict):
+        for v in obj.values():
+            reset_object(v)
+
+    elif isinstance(obj, tuple):
+        for v in obj:
+            reset_object(v)
+
+    elif isinstance(obj, list):
+        obj.clear()
+
+    elif is_mergeable(obj):
+        if hasattr(obj, "SetDirectory"):
+            obj.SetDirectory(0)
+        obj.Reset()
+
+
+def merge_objects(target, probe):
+    """Merges the content of probe into target in place, following the type of target
+    as in is_mergeable. Non-mergeable items of target are left untouched."""
+    if isinstance(target, dict) and isinstance(probe, dict):
+        for k in target:
+            if k in probe:
+                target[k] = merge_objects(target[k], probe[k])
+
+    elif isinstance(target, tuple) and isinstance(probe, tuple):
+        for t, p in zip(target, probe):
+            merge_objects(t, p)
+
+    elif isinstance(target, list) and isinstance(probe, list):
+        target.extend(probe)
+
+    elif is_mergeable(target):
+        target.Add(probe)
+
+    return target
+
+
+def autosave(obj):
+    """Saves to their files the objects written incrementally, e.g. trees.
+    Returns True if obj is or contains any of these objects."""
+    if isinstance(obj, dict):
+        return any([autosave(v) for v in obj.values()])
+
+    if isinstance(obj, (list, tuple)):
+        return any([autosave(v) for v in obj])
+
+    if hasattr(obj, "AutoSave"):
+        obj.AutoSave("SaveSelf")
+        return True
+
+    return False
+
+
+def lazy_getattr(package, names):
+    """Returns a module __getattr__ which imports package.name and returns its
+    name attribute when first accessed, e.g. to export an algorithm class from
+    its package without importing all the algorithms of the package."""
+
+    def __getattr__(name):
+        if name in names:
+            attr = getattr(importlib.import_module(f"{package}.{name}"), name)
+
+            # importing the module binds it to the package: replace it.
+            setattr(sys.modules[package], name, attr)
+
+            return attr
+        raise AttributeError(f"module {package} has no attribute {name}")
+
+    return __getattr__
+
+
+def copy_value(value):
+    """Returns a copy of an event value which does not share memory with the reader,
+    e.g. a buffer reused for the next event. Scalars are returned as they are."""
+    if value is None or isinstance(value, (bool, int, float, str, bytes, np.generic)):
+        return value
+
+    if isinstance(value, np.ndarray):
+        return value.copy()
+
+    if hasattr(value, "push_back"):
+        # std::vector, copied with its copy constructor.
+        return type(value)(value)
+
+    return deepcopy(value)
+
+
+def get_region_weights(store, r_name, n):
+    """Returns the column of weights of a batch of events for a region, e.g.
+    mySelection_myOtherSelection, which is zero for the events not passing it."""
+    r_weight, w_names = np.ones(n), set()
+
+    for sr_name in r_name.split("_"):
+
+        if sr_name == "NOSEL":
+            continue
+
+        subregion = store.get(sr_name)
+
+        r_weight = r_weight * subregion["is_passed"]
+
+        for w_name, w_value in subregion["weights"].items():
+            if not w_name in w_names:
+
+                w_names.add(w_name)
+
+                r_weight = r_weight * w_value
+
+    return r_weight
+
+
+def fill_batch(store, obj, r_name, v_names, n):
+    """Fills a histogram or graph with the events of a batch passing a region, with
+    the weights of the region. v_names are the variables of the axes. Returns True
+    if any event has been filled."""
+    r_weight = get_region_weights(store, r_name, n)
+
+    passed = r_weight != 0
+
+    if not passed.any():
+        return False
+
+    columns = [np.asarray(store.get(v), dtype=np.float64)[passed] for v in v_names]
+
+    obj.FillN(len(columns[0]), *columns, r_weight[passed])
+
+    return True
+
+
+def make_column(values):
+    """Builds a numpy array from a list of event values. Values of different
+    lengths are kept in an array of objects."""
+    try:
+        return np.array(values)
+
+    except ValueError:
+        column = np.empty(len(values), dtype=object)
+        column[:] = values
+        return column
+
+
 # EOF
@@ -0,0 +1,75 @@
+""" Event offset index of data files. The arrays of an index, e.g. the byte offset
+of each event, are saved next to the data file in a sidecar file, <file>.pyrate.idx,
+which is valid as long as the size and the modification time of the file match.
+"""
+import os
+
+import numpy as np
+
+SUFFIX = ".pyrate.idx"
+
+
+def get_key(f_name):
+    """Returns the size and modification time identifying the version of a file."""
+    stat = os.stat(f_name)
+    return np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+
+
+def load(f_name):
+    """Returns the arrays of the index of f_name, or None if missing or outdated."""
+    try:
+        with np.load(f_name + SUFFIX) as index:
+            if np.array_equal(index["key"], get_key(f_name)):
+                return {k: index[k] for k in index.files if k != "key"}
+
+    except (OSError, ValueError, KeyError):
+        pass
+
+    return None
+
+
+def save(f_name, arrays):
+    """Saves the arrays of the index of f_name. Nothing is saved if the folder of
+    the file is not writable."""
+    tmp_name = f"{f_name}{SUFFIX}.{os.getpid()}"
+
+    try:
+        with open(tmp_name, "wb") as f:
+            np.savez(f, key=get_key(f_name), **arrays)
+
+        os.replace(tmp_name, f_name + SUFFIX)
+
+    except OSError:
+        if os.path.exists(tmp_name):
+            os.remove(tmp_name)
+
+
+def get(f_name, build, keys=()):
+    """Returns the index of f_name. If it is missing, outdated or lacks any of keys
+    it is rebuilt calling build, which returns a dictionary of arrays, and saved.
+    Other arrays of a valid index are kept."""
+    arrays = load(f_name)
+
+    if arrays is None or not all(k in arrays for k in keys):
+        arrays = dict(arrays or {}, **build())
+        save(f_name, arrays)
+
+    return arrays
+
+
+def get_n_events(f_name, count):
+    """Returns the number of events of f_name saved in its index. If it is missing
+    it is counted calling count and saved. Only local files have an index."""
+    if not os.path.isfile(f_name):
+        return count()
+
+    arrays = load(f_name) or {}
+
+    if not "n_events" in arrays:
+        arrays["n_events"] = np.array([count()], dtype=np.int64)
+        save(f_name, arrays)
+
+    return int(arrays["n_events"][0])
+
+
+# EOF
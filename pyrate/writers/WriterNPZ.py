@@ -0,0 +1,49 @@
+""" NumPy writer. Objects are saved as arrays in a .npz file, e.g. for jobs
+which do not need ROOT at all. Dictionaries of objects are saved using their
+paths as array names.
+"""
+import os
+import numpy as np
+
+from pyrate.core.Writer import Writer
+
+
+class WriterNPZ(Writer):
+    __slots__ = ["f", "w_targets", "mode", "_arrays"]
+
+    def __init__(self, name, store, logger, f, w_targets, mode="RECREATE"):
+        super().__init__(name, store, logger)
+        self.f = f
+        self.w_targets = w_targets
+        self.mode = mode
+        self._arrays = {}
+
+    def load(self):
+        """Set targets. Arrays already in the file are kept if updating it."""
+        self.is_loaded = True
+
+        self.set_inputs_vs_targets(self.w_targets)
+
+        if self.mode == "UPDATE" and os.path.exists(self.f):
+            with np.load(self.f, allow_pickle=True) as f:
+                self._arrays.update(f)
+
+        for t in self.get_targets():
+            self.store.put(f"OUTPUT:{t}", self.f, "PERM")
+
+    def write(self, name):
+        """Adds an object to the arrays and rewrites the file. The whole archive is
+        written again on each call, with all the arrays written so far, as .npz files
+        cannot be appended to. The file is then complete after each target."""
+        obj = self.store.copy(name, "PERM")
+
+        if isinstance(obj, dict):
+            for path, item in obj.items():
+                self._arrays[path] = np.asarray(item)
+        else:
+            self._arrays[name] = np.asarray(obj)
+
+        np.savez(self.f, **self._arrays)
+
+
+# EOF
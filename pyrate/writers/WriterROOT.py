@@ -5,12 +5,13 @@ from pyrate.core.Writer import Writer
 
 
 class WriterROOT(Writer):
-    __slots__ = ["f", "w_targets"]
+    __slots__ = ["f", "w_targets", "mode"]
 
-    def __init__(self, name, store, logger, f, w_targets):
+    def __init__(self, name, store, logger, f, w_targets, mode="RECREATE"):
         super().__init__(name, store, logger)
         self.f = f
         self.w_targets = w_targets
+        self.mode = mode
 
     def load(self):
         """Creates the file and set targets."""
@@ -18,7 +19,7 @@ class WriterROOT(Writer):
 
         self.set_inputs_vs_targets(self.w_targets)
      
-        self.f = R.TFile(self.f, "RECREATE")
+        self.f = R.TFile(self.f, self.mode)
         
         # WARNING: if the file pointer needs to be retrieved from the store
         # by accessing the OUTPUT keys like follows, then is better for the 
@@ -1 +1,6 @@
-from pyrate.writers.WriterROOT import WriterROOT
+"""pyrate writers. Writers are imported when first accessed, so that their
+dependencies, e.g. ROOT, are only required if used."""
+
+from pyrate.utils.functions import lazy_getattr
+
+__getattr__ = lazy_getattr(__name__, ["WriterROOT", "WriterNPZ"])
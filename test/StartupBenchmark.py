@@ -0,0 +1,176 @@
+""" Startup benchmark. Measures the time from launching a pyrate job to the end of its
+first event, for a small WaveDump job written to NumPy. The job is run:
+
+    no ROOT:  with imports of ROOT and psycopg2 blocked, as if they were not installed.
+    ROOT:     with ROOT available, if installed. It should not be imported by this job.
+    eager:    importing ROOT before the job, i.e. as if all backends were imported upfront.
+
+Usage: python test/StartupBenchmark.py [-n REPEATS]
+
+The jobs import pyrate from this repository, it does not need to be installed.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+import importlib.util
+
+import yaml
+
+# root of the repository, added to the path of the jobs.
+_PYRATE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_CHILD = """
+import os
+import sys
+import json
+import time
+import importlib.abc
+
+mode, j_file = sys.argv[1], sys.argv[2]
+
+class BlockImports(importlib.abc.MetaPathFinder):
+    def find_spec(self, name, path, target=None):
+        if name.split(".")[0] in ["ROOT", "psycopg2"]:
+            raise ImportError(f"{name} is blocked")
+
+if mode == "no ROOT":
+    sys.meta_path.insert(0, BlockImports())
+
+if mode == "eager":
+    import ROOT
+
+import yaml
+
+from pyrate.core.Job import Job
+from pyrate.core.Run import Run
+
+loop = Run.loop
+
+def first_event(self, store, targets):
+    loop(self, store, targets)
+    if self.state == "execute":
+        print(json.dumps({"time": time.time(), "ROOT": "ROOT" in sys.modules}), flush=True)
+        os._exit(0)
+
+Run.loop = first_event
+
+j_config = yaml.full_load(open(j_file, "r"))
+j_config.update({"no_progress_bar": True})
+
+job = Job("benchmark", j_config, "CRITICAL")
+job.setup()
+job.launch()
+"""
+
+
+def write_job(path, n_events=100):
+    """Writes a WaveDump input file, the object configuration and the job configuration."""
+
+    with open(os.path.join(path, "wave0.txt"), "w") as f:
+        for e in range(n_events):
+            f.write("Record Length: 4\nBoardID: 31\nChannel: 0\n")
+            f.write(f"Event Number: {e}\nPattern: 0x0000\nChannel: 0\n")
+            f.write(f"Trigger Time Stamp: {10 * e}\nDC offset (DAC): 0x1999\n")
+            f.write("".join(f"{e + i}\n" for i in range(4)))
+
+    objects = {
+        "objects": {
+            "triggerTime": {
+                "algorithm": {"name": "Trigger"},
+                "triggeredch": "EVENT:RawWaveform",
+                "execute": {"input": "EVENT:RawWaveform"},
+            }
+        }
+    }
+
+    with open(os.path.join(path, "benchmark_objects.yaml"), "w") as f:
+        yaml.dump(objects, f)
+
+    job = {
+        "inputs": {
+            "waveDump": {
+                "path": os.path.join(path, "wave0.txt"),
+                "eslices": {"emin": 0, "emax": -1},
+            }
+        },
+        "configs": {"benchmark": {"path": path, "tags": {"any": "objects"}}},
+        "outputs": {
+            "benchmark": {
+                "path": path,
+                "format": ".npz",
+                "targets": [{"triggerTime": "all"}],
+            }
+        },
+    }
+
+    j_file = os.path.join(path, "benchmark_job.yaml")
+
+    with open(j_file, "w") as f:
+        yaml.dump(job, f)
+
+    return j_file
+
+
+def time_to_first_event(mode, j_file, cwd):
+    """Runs the job in a new interpreter and returns the time to the first event."""
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in [_PYRATE, env.get("PYTHONPATH")] if p
+    )
+
+    start = time.time()
+
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD, mode, j_file],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+    if out.returncode:
+        sys.exit(f"ERROR: benchmark job failed in mode {mode}.\n{out.stderr}")
+
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+
+    return result["time"] - start, result["ROOT"]
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="pyrate startup benchmark")
+    parser.add_argument("--repeats", "-n", type=int, default=5)
+    args = parser.parse_args()
+
+    modes = ["no ROOT"]
+
+    if importlib.util.find_spec("ROOT"):
+        modes.extend(["ROOT", "eager"])
+    else:
+        print("ROOT is not installed: only the job without ROOT is measured.")
+
+    with tempfile.TemporaryDirectory() as path:
+
+        j_file = write_job(path)
+
+        for mode in modes:
+            times, root_imported = [], False
+
+            for _ in range(args.repeats):
+                t, r = time_to_first_event(mode, j_file, path)
+                times.append(t)
+                root_imported |= r
+
+            print(
+                f"{mode:>8}: time to first event {statistics.median(times):.3f} s "
+                f"(median of {args.repeats}), ROOT imported: {root_imported}"
+            )
+
+
+# EOF
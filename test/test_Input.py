@@ -0,0 +1,56 @@
+""" Tests of the choice of the reader of .dat files.
+"""
+import struct
+
+from pyrate.core.Input import is_wavedump_binary
+
+
+def write_wavedump(path, n_events, n_samples=10):
+    """Writes binary WaveDump events: six 32-bit header words and 16-bit samples."""
+    size = 24 + 2 * n_samples
+
+    with open(path, "wb") as f:
+        for idx in range(n_events):
+            f.write(struct.pack("<6I", size, 0, 0, 0, idx, 0))
+            f.write(struct.pack(f"<{n_samples}h", *range(n_samples)))
+
+    return size
+
+
+def test_wavedump_binary(tmp_path):
+    f_name = tmp_path / "wave0.dat"
+
+    write_wavedump(f_name, 3)
+
+    assert is_wavedump_binary(f_name)
+
+
+def test_wavedump_binary_truncated(tmp_path):
+    """Files truncated in the middle of an event are decided from their first event."""
+    f_name = tmp_path / "wave0.dat"
+
+    size = write_wavedump(f_name, 3)
+
+    with open(f_name, "r+b") as f:
+        f.truncate(2 * size + size // 2)
+
+    assert is_wavedump_binary(f_name)
+
+    with open(f_name, "r+b") as f:
+        f.truncate(size - 2)
+
+    assert not is_wavedump_binary(f_name)
+
+
+def test_wavecatcher(tmp_path):
+    f_name = tmp_path / "run.dat"
+
+    f_name.write_text(
+        "=== DATA FILE SAVED WITH SOFTWARE VERSION: V2.9.13 ===\n"
+        "=== WAVECATCHER SYSTEM OF TYPE 1 WITH 2 CHANNELS AND GAIN: 1.0 ===\n"
+    )
+
+    assert not is_wavedump_binary(f_name)
+
+
+# EOF
@@ -0,0 +1,51 @@
+""" Tests of the cache of the results of database queries.
+"""
+import os
+import logging
+
+from pyrate.core.QueryCache import QueryCache
+
+
+def test_copies():
+    """Changing a result does not change the cached one."""
+    cache = QueryCache("test", logging.getLogger("test"))
+
+    result = [(1, [2, 3])]
+
+    cache.put("q", result)
+    result[0][1].append(4)
+
+    found, value = cache.get("q")
+
+    assert found and value == [(1, [2, 3])]
+
+    value.append((5, []))
+
+    assert cache.get("q") == (True, [(1, [2, 3])])
+
+
+def test_eviction(tmp_path, monkeypatch):
+    """At most size results are kept on disk, without listing the folder at each put."""
+    listdir, n_lists = os.listdir, []
+
+    def count_listdir(path):
+        n_lists.append(path)
+        return listdir(path)
+
+    monkeypatch.setattr(os, "listdir", count_listdir)
+
+    cache = QueryCache("test", logging.getLogger("test"), size=100, path=str(tmp_path))
+
+    for idx in range(500):
+        cache.put(f"q{idx}", idx)
+
+    assert len(listdir(tmp_path)) <= 100
+    assert len(n_lists) <= 50
+
+    # the most recent result is still on disk.
+    assert QueryCache("test", logging.getLogger("test"), path=str(tmp_path)).get(
+        "q499"
+    ) == (True, 499)
+
+
+# EOF
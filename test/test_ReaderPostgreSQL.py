@@ -0,0 +1,54 @@
+""" Tests of the parsing of the binary COPY output of PostgreSQL.
+"""
+import struct
+
+import numpy as np
+import pytest
+
+pytest.importorskip("psycopg2")
+
+from pyrate.readers.ReaderPostgreSQL import ReaderPostgreSQL, _COPY_SIGNATURE
+
+INT4, FLOAT8 = 23, 701
+
+
+def copy_buffer(rows):
+    """Builds a binary COPY output of int4 and float8 columns, None being NULL."""
+    data = _COPY_SIGNATURE + struct.pack(">ii", 0, 0)
+
+    for row in rows:
+        data += struct.pack(">h", len(row))
+
+        for value, fmt in zip(row, (">i", ">d")):
+            if value is None:
+                data += struct.pack(">i", -1)
+            else:
+                data += struct.pack(">i", struct.calcsize(fmt)) + struct.pack(fmt, value)
+
+    return data + struct.pack(">h", -1)
+
+
+def test_parse_copy():
+    data = copy_buffer([(1, 0.5), (2, 1.5), (-3, 2.5)])
+
+    arrays = ReaderPostgreSQL._parse_copy(data, ["a", "b"], [INT4, FLOAT8])
+
+    assert arrays["a"].tolist() == [1, 2, -3]
+    assert arrays["b"].tolist() == [0.5, 1.5, 2.5]
+    assert arrays["a"].dtype == np.int32 and arrays["a"].dtype.isnative
+
+
+def test_parse_copy_empty():
+    arrays = ReaderPostgreSQL._parse_copy(copy_buffer([]), ["a", "b"], [INT4, FLOAT8])
+
+    assert len(arrays["a"]) == 0 and len(arrays["b"]) == 0
+
+
+def test_parse_copy_null():
+    """Rows with NULL values do not have a fixed size and are not parsed."""
+    data = copy_buffer([(1, 0.5), (2, None), (3, 2.5)])
+
+    assert ReaderPostgreSQL._parse_copy(data, ["a", "b"], [INT4, FLOAT8]) is None
+
+
+# EOF
@@ -0,0 +1,185 @@
+""" Tests of the store: objects on the TRAN, PERM, READY and WRITTEN stores,
+generations of the transient objects and placeholders.
+"""
+import gc
+import logging
+import weakref
+
+import pytest
+
+from pyrate.core.Store import Store
+
+
+class Run:
+    """Minimal run: objects missing from the store are computed by update_store."""
+
+    def __init__(self, state="execute"):
+        self.name = "test"
+        self.state = state
+        self.logger = logging.getLogger("test")
+        self.computed = {}
+
+    def update_store(self, name, store):
+        if name in self.computed:
+            store.put(name, self.computed[name])
+
+
+class Obj:
+    pass
+
+
+@pytest.fixture
+def store():
+    return Store(Run())
+
+
+def test_put_get(store):
+    """Objects are found on the store they are put on, TRAN first without option."""
+    store.put("a", 1, "TRAN")
+    store.put("a", 2, "PERM")
+    store.put("b", 3, "READY")
+    store.put("c", 4, "WRITTEN")
+
+    assert store.get("a") == 1
+    assert store.get("a", "PERM") == 2
+    assert store.get("b") == 3
+    assert store.get("c", "WRITTEN") == 4
+
+    assert store.check("a", "TRAN") and store.check("a", "PERM")
+    assert not store.check("b", "PERM")
+    assert store.check("any", "PERM") == {"a": 2}
+
+
+def test_put_default_store():
+    """Objects are put on the default store of the state of the run."""
+    run = Run("initialise")
+    store = Store(run)
+
+    store.put("a", 1)
+
+    assert store.check("a", "PERM") and not store.check("a", "TRAN")
+
+    run.state = "execute"
+    store.set_state(run.state)
+
+    store.put("b", 2)
+
+    assert store.check("b", "TRAN") and not store.check("b", "PERM")
+
+
+def test_put_twice(store):
+    """Objects are put only once, unless replaced."""
+    store.put("a", 1, "TRAN")
+    store.put("a", 2, "TRAN")
+
+    assert store.get("a") == 1
+
+    store.put("a", 2, "TRAN", replace=True)
+
+    assert store.get("a") == 2
+
+
+def test_advance(store):
+    """Transient objects are only valid in the generation they are put in."""
+    store.put("a", 1, "TRAN")
+    store.put("b", 2, "PERM")
+
+    store.advance()
+
+    assert not store.exists("a") and not store.check("a", "TRAN")
+    assert store.get("b") == 2
+
+    store.put("a", 3, "TRAN")
+
+    assert store.get("a") == 3
+
+
+def test_advance_releases_objects(store):
+    """Transient objects are not referenced by the store after advancing."""
+    obj = Obj()
+    ref = weakref.ref(obj)
+
+    store.put("a", obj, "TRAN")
+
+    del obj
+    store.advance()
+    gc.collect()
+
+    assert ref() is None
+
+
+def test_pin(store):
+    """Pinned objects stay valid across generations until the store is cleared."""
+    store.pin("INPUT:name", "A")
+    store.put("a", 1, "TRAN")
+
+    store.advance()
+
+    assert store.get("INPUT:name") == "A"
+    assert not store.exists("a")
+
+    store.clear("TRAN")
+
+    assert not store.exists("INPUT:name")
+
+
+def test_clear(store):
+    """Clearing a store keeps the other ones."""
+    store.put("a", 1, "PERM")
+    store.put("a", True, "READY")
+
+    store.clear("PERM")
+
+    assert not store.check("a", "PERM")
+    assert store.check("a", "READY")
+
+    store.clear("all")
+
+    assert not store.exists("a")
+
+
+def test_placeholder(store):
+    """Placeholders mark objects as existing but not available, and can be replaced."""
+    store.put("a", "PYRATE:none", "TRAN")
+
+    assert store.exists("a")
+    assert not store.check("a", "TRAN")
+
+    store.put("a", 1, "TRAN")
+
+    assert store.check("a", "TRAN") and store.get("a") == 1
+
+    store.put("b", "PYRATE:none", "PERM")
+
+    assert not store.check("b", "PERM")
+    assert store.check("any", "PERM") == {"b": "PYRATE:none"}
+
+
+def test_get_missing():
+    """Missing objects are computed on demand, or the job exits."""
+    run = Run()
+    run.computed["a"] = 1
+
+    store = Store(run)
+
+    assert store.get("a") == 1
+
+    with pytest.raises(SystemExit):
+        store.get("b")
+
+
+def test_get_created():
+    """PERM objects put in the initialise state are tracked, except INPUT: objects."""
+    run = Run("initialise")
+    store = Store(run)
+
+    h_input = Obj()
+
+    store.put("INPUT:h", h_input, "TRAN")
+    store.put("calibration", h_input, "PERM")
+    store.put("hist", Obj(), "PERM")
+
+    assert list(store.get_created()) == ["hist"]
+
+
+# EOF
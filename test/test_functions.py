@@ -0,0 +1,93 @@
+""" Tests of the merging of the objects filled by worker processes.
+"""
+import numpy as np
+
+from pyrate.utils import functions as FN
+
+
+def merge_workers(target, results):
+    """Merges the results of the workers as the parent process does."""
+    for probe in results:
+        FN.merge_objects(target, probe)
+
+    return target
+
+
+def test_merge_list_of_lists():
+    """Lists of records are extended whatever their records are."""
+    results = [[[0, 1], [1, 2]], [[2, 3]], [[3, 4], [4, 5]], []]
+
+    assert merge_workers([], results) == [[0, 1], [1, 2], [2, 3], [3, 4], [4, 5]]
+
+
+def test_merge_tuple_of_lists():
+    """Tuples have a fixed structure and are merged item by item."""
+    results = [([1], []), ([2], [3]), ([], [4])]
+
+    assert merge_workers(([], []), results) == ([1, 2], [3, 4])
+
+
+def test_merge_dict():
+    """Dictionaries are merged by key, non-mergeable values are left untouched."""
+    target = {"records": [], "bins": ([], []), "n_bins": 2}
+
+    results = [
+        {"records": [[0]], "bins": ([0], []), "n_bins": 2},
+        {"records": [[1]], "bins": ([], [1]), "n_bins": 2},
+        {"records": [[2]], "bins": ([2], []), "n_bins": 2},
+    ]
+
+    assert merge_workers(target, results) == {
+        "records": [[0], [1], [2]],
+        "bins": ([0, 2], [1]),
+        "n_bins": 2,
+    }
+
+
+def test_reset_object():
+    """Objects are emptied keeping their structure."""
+    obj = {"records": [[0], [1]], "bins": ([0], [1, 2]), "n_bins": 2}
+
+    FN.reset_object(obj)
+
+    assert obj == {"records": [], "bins": ([], []), "n_bins": 2}
+
+
+def test_autosave():
+    """Objects written incrementally are saved within dictionaries, lists and tuples."""
+
+    class Tree:
+        saved = False
+
+        def AutoSave(self, option):
+            self.saved = True
+
+    tree = Tree()
+
+    assert FN.autosave({"trees": ([], [tree])})
+    assert tree.saved
+    assert not FN.autosave({"records": [[0]], "bins": ([0], [])})
+
+
+def test_fill_batch():
+    """Events of a batch are filled with the weights of the regions they pass."""
+
+    class Hist:
+        def FillN(self, n, *columns):
+            self.columns = [list(c) for c in columns]
+
+    store = {
+        "sel1": {"is_passed": np.array([1, 0, 1, 1]), "weights": {"w": np.full(4, 2.0)}},
+        "sel2": {"is_passed": np.array([1, 1, 0, 1]), "weights": {"w": np.full(4, 2.0)}},
+        "sel3": {"is_passed": np.zeros(4), "weights": {}},
+        "x": np.array([1, 2, 3, 4]),
+    }
+
+    h = Hist()
+
+    assert FN.fill_batch(store, h, "sel1_sel2", ["x"], 4)
+    assert h.columns == [[1.0, 4.0], [2.0, 2.0]]
+    assert not FN.fill_batch(store, h, "sel1_sel3", ["x"], 4)
+
+
+# EOF